@@ -6,13 +6,9 @@ This file initializes the Streamlit interface and orchestrates the application f
 import streamlit as st
 import os
 from dotenv import load_dotenv
-import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-
-from src.document_loader import DocumentLoader
-from src.utils import create_document_chunks
-from src.rag_pipeline import RAGPipeline
-from src.generation_chains import JobApplicationGenerator
+from string import Template
 
 # Load environment variables
 load_dotenv()
@@ -24,8 +20,176 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# Custom CSS for better styling
-st.markdown("""
+# The key check must not stall a rerun: one quick request, no client-side retries
+API_KEY_CHECK_TIMEOUT = 10
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def check_api_key(api_key):
+    """
+    Check the API key with one live request. Returns False if OpenAI rejects the key.
+    Other errors are raised and not cached here. The TTL re-checks keys that get revoked.
+    """
+    from openai import OpenAI, AuthenticationError, PermissionDeniedError
+    client = OpenAI(api_key=api_key, timeout=API_KEY_CHECK_TIMEOUT, max_retries=0)
+    try:
+        client.models.list()
+    except PermissionDeniedError:
+        # Restricted keys may not list models, but they did authenticate
+        pass
+    except AuthenticationError:
+        return False
+    return True
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _check_api_key_briefly(api_key):
+    """
+    Check the key, caching inconclusive results (network errors) for a minute so
+    reruns don't repeat a slow request. Returns (is_valid, error message or None).
+    """
+    try:
+        return check_api_key(api_key), None
+    except Exception as e:
+        return True, str(e)
+
+def is_valid_api_key(api_key):
+    """Return False for missing, placeholder, or rejected API keys."""
+    if not api_key or api_key.startswith("sk-your-") or api_key == "your_api_key_here":
+        return False
+    is_valid, error = _check_api_key_briefly(api_key)
+    if error:
+        # Don't block the app when the key could not be verified
+        st.warning(f"Could not verify OPENAI_API_KEY: {error}")
+    return is_valid
+
+# Check for valid API key
+api_key = os.getenv("OPENAI_API_KEY")
+if not is_valid_api_key(api_key):
+    st.error("Please set a valid OPENAI_API_KEY in your .env file")
+    st.info("Get your API key from: https://platform.openai.com/api-keys")
+    st.markdown("""
+    **Steps to fix:**
+    1. Go to https://platform.openai.com/api-keys
+    2. Create a new API key
+    3. Open `job-assistant/.env` file
+    4. Replace `sk-your-key-here` with your actual API key
+    5. Restart the application
+    """)
+    st.stop()
+
+# Shared resources (one instance per process, reused across sessions and reruns).
+# The src modules pull in langchain, chromadb, pypdf, etc., so they are imported
+# inside the functions that need them and only load on a cache miss.
+@st.cache_resource
+def get_rag_pipeline(api_key):
+    """Create the RAG pipeline once per API key."""
+    from src.rag_pipeline import RAGPipeline
+    # A user's uploads easily fit in memory, so search them there instead of through Chroma
+    return RAGPipeline(openai_api_key=api_key, in_memory_search=True)
+
+@st.cache_resource
+def get_generator(_rag_pipeline, api_key):
+    """Create the generator once per API key. The pipeline is not hashed."""
+    from src.generation_chains import JobApplicationGenerator
+    return JobApplicationGenerator(
+        rag_pipeline=_rag_pipeline,
+        openai_api_key=api_key
+    )
+
+# Parsed and chunked uploads are persisted to disk so they survive app restarts
+@st.cache_data(persist="disk", show_spinner=False, max_entries=128)
+def _parse_file(name, data):
+    """Parse an uploaded file in memory. Cached on the file bytes so re-uploads skip parsing."""
+    from src.document_loader import DocumentLoader
+    # Streamlit already caches this call, so skip the loader's on-disk cache and its SQLite handle
+    return DocumentLoader(cache_dir=None).load_from_bytes(name, data)
+
+@st.cache_data(persist="disk", show_spinner=False, max_entries=128)
+def _chunk(content, filename, file_type):
+    """Clean and chunk a parsed document. Cached on its text and source name."""
+    from src.utils import create_document_chunks
+    return create_document_chunks({
+        'content': content,
+        'filename': filename,
+        'file_type': file_type
+    })
+
+# Keys of the outputs produced by Generate All
+GENERATED_OUTPUTS = ("resume_bullets", "cover_letter", "ats_analysis", "linkedin_message")
+
+class GenerationFailed(Exception):
+    """Raised by _generate_all when any output failed, so the partial results are not cached."""
+
+    def __init__(self, results):
+        super().__init__("Some materials failed to generate")
+        self.results = results
+
+@st.cache_data(ttl=3600, max_entries=256, show_spinner=False)
+def _generate_all(_generator, job_description, company_name, role_title, candidate_name, resume_content, store_version):
+    """
+    Generate all materials, with the four LLM calls running concurrently.
+    Cached for an hour on the job details and the vector store version, which
+    changes whenever documents are indexed or reset, so re-indexed content is never served stale.
+    """
+    from src.event_loop import run_sync
+    from src.generation_chains import RetrievalError
+    try:
+        # One long-lived loop, so the LLM client's pooled async connections stay usable across runs
+        results = run_sync(_generator.agenerate_all(
+            job_description=job_description,
+            company_name=company_name,
+            role_title=role_title,
+            candidate_name=candidate_name,
+            resume_content=resume_content
+        ))
+    except RetrievalError as e:
+        # Materials written without the user's documents must not be shown or cached as a success
+        raise GenerationFailed({key: f"Error: {e}" for key in GENERATED_OUTPUTS}) from e
+    if any(value.startswith("Error:") for value in results.values()):
+        # Raising keeps Streamlit from caching this call without touching other entries
+        raise GenerationFailed(results)
+    return results
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def _docx_bytes(content):
+    """Build a DOCX file for download. Cached on the content so reruns skip python-docx."""
+    from docx import Document
+    from io import BytesIO
+
+    doc = Document()
+    for line in content.split('\n'):
+        if line.strip():
+            doc.add_paragraph(line)
+
+    bio = BytesIO()
+    doc.save(bio)
+    return bio.getvalue()
+
+# Initialize session state
+def init_session_state():
+    """Initialize session state variables."""
+    if 'rag_pipeline' not in st.session_state:
+        api_key = os.getenv("OPENAI_API_KEY")
+        if api_key:
+            st.session_state.rag_pipeline = get_rag_pipeline(api_key)
+            st.session_state.generator = get_generator(st.session_state.rag_pipeline, api_key)
+        else:
+            st.session_state.rag_pipeline = None
+            st.session_state.generator = None
+    
+    if 'documents_indexed' not in st.session_state:
+        st.session_state.documents_indexed = False
+    
+    if 'indexed_files' not in st.session_state:
+        st.session_state.indexed_files = []
+    
+    # Initialize dark mode (default to dark)
+    if 'dark_mode' not in st.session_state:
+        st.session_state.dark_mode = True
+
+init_session_state()
+
+# Base CSS shared by both themes
+BASE_CSS = """
     <style>
     /* Increase base font size for all text */
     html, body, [class*="css"] {
@@ -63,260 +227,219 @@ st.markdown("""
         font-size: 18px !important;
     }
     </style>
-""", unsafe_allow_html=True)
-
-# Check for valid API key
-api_key = os.getenv("OPENAI_API_KEY")
-if not api_key or api_key.startswith("sk-your-") or api_key == "your_api_key_here":
-    st.error("Please set a valid OPENAI_API_KEY in your .env file")
-    st.info("Get your API key from: https://platform.openai.com/api-keys")
-    st.markdown("""
-    **Steps to fix:**
-    1. Go to https://platform.openai.com/api-keys
-    2. Create a new API key
-    3. Open `job-assistant/.env` file
-    4. Replace `sk-your-key-here` with your actual API key
-    5. Restart the application
-    """)
-    st.stop()
-
-# Initialize session state
-def init_session_state():
-    """Initialize session state variables."""
-    if 'rag_pipeline' not in st.session_state:
-        api_key = os.getenv("OPENAI_API_KEY")
-        if api_key:
-            st.session_state.rag_pipeline = RAGPipeline(openai_api_key=api_key)
-            st.session_state.generator = JobApplicationGenerator(
-                rag_pipeline=st.session_state.rag_pipeline,
-                openai_api_key=api_key
-            )
-        else:
-            st.session_state.rag_pipeline = None
-            st.session_state.generator = None
-    
-    if 'documents_indexed' not in st.session_state:
-        st.session_state.documents_indexed = False
-    
-    if 'indexed_files' not in st.session_state:
-        st.session_state.indexed_files = []
-    
-    # Initialize dark mode (default to dark)
-    if 'dark_mode' not in st.session_state:
-        st.session_state.dark_mode = True
-
-init_session_state()
+"""
 
-# Apply theme-based styling
-def apply_theme():
-    """Apply dark or light theme based on session state."""
-    if st.session_state.dark_mode:
-        # Dark mode colors - improved for better readability
-        bg_color = "#1a1a2e"
-        sidebar_bg = "#16213e"
-        text_color = "#ffffff"  # Bright white for main text
-        secondary_text = "#e0e0e0"  # Slightly dimmer for secondary text
-        heading_color = "#ffffff"  # White for headings
-        accent_color = "#0f3460"
-        card_bg = "#2d3748"  # Dark card background
-        border_color = "#533483"
-        input_bg = "#2d3748"  # Dark input background
-        input_text = "#ffffff"
-        button_bg = "#2d3748"  # Dark button background
-        button_text = "#ffffff"  # White text for dark buttons
-        box_bg = "#2d3748"  # Dark background for boxes
-    else:
-        # Light mode colors
-        bg_color = "#ffffff"
-        sidebar_bg = "#f8f9fa"
-        text_color = "#1a1a1a"
-        secondary_text = "#333333"
-        heading_color = "#1a1a1a"
-        accent_color = "#e8eaf6"
-        card_bg = "#f5f5f5"
-        border_color = "#9c27b0"
-        input_bg = "#ffffff"
-        input_text = "#1a1a1a"
-        button_bg = "#f8f9fa"
-        button_text = "#1a1a1a"
-        box_bg = "#ffffff"
-    
-    st.markdown(f"""
+# Theme colors
+DARK_THEME = {
+    # Improved for better readability
+    'bg_color': "#1a1a2e",
+    'sidebar_bg': "#16213e",
+    'text_color': "#ffffff",  # Bright white for main text
+    'secondary_text': "#e0e0e0",  # Slightly dimmer for secondary text
+    'heading_color': "#ffffff",  # White for headings
+    'accent_color': "#0f3460",
+    'card_bg': "#2d3748",  # Dark card background
+    'border_color': "#533483",
+    'input_bg': "#2d3748",  # Dark input background
+    'input_text': "#ffffff",
+    'button_bg': "#2d3748",  # Dark button background
+    'button_text': "#ffffff",  # White text for dark buttons
+    'box_bg': "#2d3748",  # Dark background for boxes
+}
+
+LIGHT_THEME = {
+    'bg_color': "#ffffff",
+    'sidebar_bg': "#f8f9fa",
+    'text_color': "#1a1a1a",
+    'secondary_text': "#333333",
+    'heading_color': "#1a1a1a",
+    'accent_color': "#e8eaf6",
+    'card_bg': "#f5f5f5",
+    'border_color': "#9c27b0",
+    'input_bg': "#ffffff",
+    'input_text': "#1a1a1a",
+    'button_bg': "#f8f9fa",
+    'button_text': "#1a1a1a",
+    'box_bg': "#ffffff",
+}
+
+# Theme stylesheet, compiled once at import. Placeholders are $-prefixed theme color keys.
+THEME_CSS = Template("""
         <style>
         /* Base font size for all text */
-        html, body, [class*="css"] {{
+        html, body, [class*="css"] {
             font-size: 14px !important;
-        }}
+        }
         
         /* Remove white space at top */
-        .main .block-container {{
+        .main .block-container {
             padding-top: 2rem !important;
-        }}
+        }
         
         /* Hide Streamlit header */
-        header {{
-            background-color: {bg_color} !important;
-        }}
+        header {
+            background-color: $bg_color !important;
+        }
         
-        header[data-testid="stHeader"] {{
-            background-color: {bg_color} !important;
-        }}
+        header[data-testid="stHeader"] {
+            background-color: $bg_color !important;
+        }
         
         /* Main toolbar */
-        .stApp header {{
-            background-color: {bg_color} !important;
-        }}
+        .stApp header {
+            background-color: $bg_color !important;
+        }
         
         /* Top padding area */
-        .main {{
-            background-color: {bg_color} !important;
-        }}
+        .main {
+            background-color: $bg_color !important;
+        }
         
         /* Main app background */
-        .stApp {{
-            background-color: {bg_color};
-            color: {text_color};
-        }}
+        .stApp {
+            background-color: $bg_color;
+            color: $text_color;
+        }
         
         /* All text elements */
-        p, div, span, label {{
-            color: {text_color} !important;
+        p, div, span, label {
+            color: $text_color !important;
             font-size: 14px !important;
-        }}
+        }
         
         /* Headings */
-        h1, h2, h3, h4, h5, h6 {{
-            color: {heading_color} !important;
+        h1, h2, h3, h4, h5, h6 {
+            color: $heading_color !important;
             font-weight: 700 !important;
-        }}
+        }
         
-        h1 {{ font-size: 1.75rem !important; }}
-        h2 {{ font-size: 1.35rem !important; }}
-        h3 {{ font-size: 1.15rem !important; }}
+        h1 { font-size: 1.75rem !important; }
+        h2 { font-size: 1.35rem !important; }
+        h3 { font-size: 1.15rem !important; }
         
         /* Sidebar styling */
-        [data-testid="stSidebar"] {{
-            background-color: {sidebar_bg};
+        [data-testid="stSidebar"] {
+            background-color: $sidebar_bg;
             padding-top: 2rem;
-        }}
+        }
         
-        [data-testid="stSidebar"] * {{
-            color: {text_color} !important;
-        }}
+        [data-testid="stSidebar"] * {
+            color: $text_color !important;
+        }
         
-        [data-testid="stSidebar"] [data-testid="stMarkdownContainer"] {{
-            color: {text_color} !important;
-        }}
+        [data-testid="stSidebar"] [data-testid="stMarkdownContainer"] {
+            color: $text_color !important;
+        }
         
         /* Sidebar title */
-        [data-testid="stSidebar"] h1 {{
-            color: {heading_color} !important;
+        [data-testid="stSidebar"] h1 {
+            color: $heading_color !important;
             font-size: 1.5rem !important;
             font-weight: 700 !important;
             padding: 0 1rem;
             margin-bottom: 0.5rem;
-        }}
+        }
         
         /* Text inputs and text areas */
-        .stTextInput input, .stTextArea textarea {{
-            background-color: {input_bg} !important;
-            color: {input_text} !important;
+        .stTextInput input, .stTextArea textarea {
+            background-color: $input_bg !important;
+            color: $input_text !important;
             font-size: 13px !important;
-            border: 1px solid {border_color} !important;
-        }}
+            border: 1px solid $border_color !important;
+        }
         
-        .stTextInput input::placeholder, .stTextArea textarea::placeholder {{
-            color: {secondary_text} !important;
+        .stTextInput input::placeholder, .stTextArea textarea::placeholder {
+            color: $secondary_text !important;
             opacity: 0.6;
-        }}
+        }
         
         /* Labels */
-        label {{
+        label {
             font-size: 13px !important;
             font-weight: 600 !important;
-            color: {text_color} !important;
-        }}
+            color: $text_color !important;
+        }
         
         /* Markdown content */
-        .stMarkdown {{
+        .stMarkdown {
             font-size: 14px !important;
-            color: {text_color} !important;
-        }}
+            color: $text_color !important;
+        }
         
         /* Info/warning/error messages */
-        .stAlert {{
+        .stAlert {
             font-size: 13px !important;
-        }}
+        }
         
         /* File uploader - dark background in dark mode */
-        [data-testid="stFileUploader"] {{
-            background-color: {box_bg} !important;
-        }}
+        [data-testid="stFileUploader"] {
+            background-color: $box_bg !important;
+        }
         
-        [data-testid="stFileUploader"] section {{
-            background-color: {box_bg} !important;
+        [data-testid="stFileUploader"] section {
+            background-color: $box_bg !important;
             border: 1px solid #4a5568 !important;  /* Solid gray border instead of dashed purple */
-        }}
+        }
         
-        [data-testid="stFileUploader"] label {{
-            color: {text_color} !important;
-        }}
+        [data-testid="stFileUploader"] label {
+            color: $text_color !important;
+        }
         
-        [data-testid="stFileUploader"] small {{
-            color: {secondary_text} !important;
-        }}
+        [data-testid="stFileUploader"] small {
+            color: $secondary_text !important;
+        }
         
         /* File uploader drag and drop area */
-        [data-testid="stFileUploadDropzone"] {{
-            background-color: {box_bg} !important;
+        [data-testid="stFileUploadDropzone"] {
+            background-color: $box_bg !important;
             border: 1px solid #4a5568 !important;  /* Solid gray border */
-        }}
+        }
         
         /* Browse Files button inside file uploader */
-        [data-testid="stFileUploader"] button {{
-            background-color: {button_bg} !important;
-            color: {button_text} !important;
+        [data-testid="stFileUploader"] button {
+            background-color: $button_bg !important;
+            color: $button_text !important;
             border: 1px solid #4a5568 !important;  /* Gray border instead of purple */
             font-size: 16px !important;
             outline: none !important;  /* Remove outline */
-        }}
+        }
         
-        [data-testid="stFileUploader"] button:hover {{
+        [data-testid="stFileUploader"] button:hover {
             background: linear-gradient(135deg, #667eea 0%, #764ba2 100%) !important;
             color: white !important;
             border: 1px solid transparent !important;
-        }}
+        }
         
-        [data-testid="stFileUploader"] button:focus {{
+        [data-testid="stFileUploader"] button:focus {
             outline: none !important;  /* Remove focus outline */
             box-shadow: none !important;
-        }}
+        }
         
         /* All white boxes/containers */
-        .element-container {{
+        .element-container {
             background-color: transparent !important;
-        }}
+        }
         
         /* Form containers */
-        [data-testid="stForm"] {{
+        [data-testid="stForm"] {
             background-color: transparent !important;
-        }}
+        }
         
         /* Column containers */
-        [data-testid="column"] {{
+        [data-testid="column"] {
             background-color: transparent !important;
-        }}
+        }
         
         /* Navigation radio buttons - make them look like modern nav items */
-        [data-testid="stSidebar"] .stRadio > label {{
+        [data-testid="stSidebar"] .stRadio > label {
             display: none;
-        }}
+        }
         
-        [data-testid="stSidebar"] .stRadio > div {{
+        [data-testid="stSidebar"] .stRadio > div {
             gap: 0.5rem;
-        }}
+        }
         
-        [data-testid="stSidebar"] .stRadio > div > label {{
+        [data-testid="stSidebar"] .stRadio > div > label {
             background-color: transparent;
             border-radius: 8px;
             padding: 0.75rem 1rem;
@@ -324,90 +447,90 @@ def apply_theme():
             cursor: pointer;
             transition: all 0.3s ease;
             border: none;
-            color: {text_color} !important;
+            color: $text_color !important;
             font-size: 15px !important;
             display: flex;
             align-items: center;
-        }}
+        }
         
-        [data-testid="stSidebar"] .stRadio > div > label:hover {{
+        [data-testid="stSidebar"] .stRadio > div > label:hover {
             background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
             color: white !important;
             transform: translateX(5px);
-        }}
+        }
         
-        [data-testid="stSidebar"] .stRadio > div > label[data-baseweb="radio"] > div:first-child {{
+        [data-testid="stSidebar"] .stRadio > div > label[data-baseweb="radio"] > div:first-child {
             display: none;
-        }}
+        }
         
         /* Active navigation item */
-        [data-testid="stSidebar"] .stRadio > div > label > div[data-checked="true"] {{
+        [data-testid="stSidebar"] .stRadio > div > label > div[data-checked="true"] {
             background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
             color: white !important;
-        }}
+        }
         
         /* Buttons - Fix text color for readability */
-        .stButton > button {{
+        .stButton > button {
             font-size: 13px !important;
             font-weight: 600 !important;
             padding: 0.5rem 1rem !important;
             outline: none !important;
-        }}
+        }
         
-        .stButton > button:focus {{
+        .stButton > button:focus {
             outline: none !important;
             box-shadow: none !important;
-        }}
+        }
         
         /* Primary buttons (with colored background) */
-        .stButton > button[kind="primary"] {{
+        .stButton > button[kind="primary"] {
             color: white !important;
             background-color: #dc3545 !important;
             border: 1px solid #dc3545 !important;
-        }}
+        }
         
         /* Secondary buttons (default - dark background in dark mode) */
-        .stButton > button[kind="secondary"] {{
-            color: {button_text} !important;
-            background-color: {button_bg} !important;
+        .stButton > button[kind="secondary"] {
+            color: $button_text !important;
+            background-color: $button_bg !important;
             border: 1px solid #4a5568 !important;  /* Gray border instead of purple */
-        }}
+        }
         
         /* Default buttons */
-        .stButton > button:not([kind]) {{
-            color: {button_text} !important;
-            background-color: {button_bg} !important;
+        .stButton > button:not([kind]) {
+            color: $button_text !important;
+            background-color: $button_bg !important;
             border: 1px solid #4a5568 !important;  /* Gray border instead of purple */
-        }}
+        }
         
         /* Download buttons */
-        .stDownloadButton > button {{
-            color: {button_text} !important;
-            background-color: {button_bg} !important;
+        .stDownloadButton > button {
+            color: $button_text !important;
+            background-color: $button_bg !important;
             border: 1px solid #4a5568 !important;  /* Gray border instead of purple */
             font-size: 14px !important;
             outline: none !important;
-        }}
+        }
         
-        .stDownloadButton > button:focus {{
+        .stDownloadButton > button:focus {
             outline: none !important;
             box-shadow: none !important;
-        }}
+        }
         
         /* Form submit button */
-        button[type="submit"] {{
+        button[type="submit"] {
             color: white !important;
-        }}
+        }
         
         /* Theme toggle button styling */
-        .theme-toggle {{
+        .theme-toggle {
             position: fixed;
             bottom: 2rem;
             left: 1rem;
             z-index: 999;
-        }}
+        }
         
-        .theme-toggle button {{
+        .theme-toggle button {
             background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
             color: white !important;
             border: none;
@@ -418,16 +541,52 @@ def apply_theme():
             cursor: pointer;
             box-shadow: 0 4px 15px rgba(102, 126, 234, 0.4);
             transition: all 0.3s ease;
-        }}
+        }
         
-        .theme-toggle button:hover {{
+        .theme-toggle button:hover {
             transform: translateY(-2px);
             box-shadow: 0 6px 20px rgba(102, 126, 234, 0.6);
-        }}
+        }
+
+        /* Generated output blocks - card colors so text stays readable in both themes */
+        .generated-content {
+            background-color: $card_bg;
+            color: $text_color;
+        }
+
+        .generated-content p, .generated-content div, .generated-content span, .generated-content li {
+            color: $text_color !important;
+        }
         </style>
-    """, unsafe_allow_html=True)
+""")
 
-apply_theme()
+# Apply theme-based styling
+@st.cache_data(show_spinner=False)
+def _theme_css(dark_mode):
+    """Build the full stylesheet for a theme. Cached, so it is built once per theme."""
+    colors = DARK_THEME if dark_mode else LIGHT_THEME
+    return BASE_CSS + THEME_CSS.substitute(colors)
+
+def apply_theme():
+    """Apply dark or light theme based on session state."""
+    st.markdown(_theme_css(st.session_state.dark_mode), unsafe_allow_html=True)
+
+def toggle_theme():
+    """Switch between dark and light mode."""
+    st.session_state.dark_mode = not st.session_state.dark_mode
+
+@st.fragment
+def theme_toggle_fragment():
+    """
+    Render the theme stylesheet and toggle button.
+    Clicking the toggle reruns only this fragment, which re-injects the stylesheet.
+    """
+    apply_theme()
+
+    theme_icon = "" if st.session_state.dark_mode else ""
+    theme_text = "Light Mode" if st.session_state.dark_mode else "Dark Mode"
+
+    st.button(f"{theme_icon} {theme_text}", key="theme_toggle", on_click=toggle_theme, use_container_width=True)
 
 # Sidebar navigation
 with st.sidebar:
@@ -444,12 +603,7 @@ with st.sidebar:
     st.markdown("---")
     
     # Theme toggle button
-    theme_icon = "" if st.session_state.dark_mode else ""
-    theme_text = "Light Mode" if st.session_state.dark_mode else "Dark Mode"
-    
-    if st.button(f"{theme_icon} {theme_text}", key="theme_toggle", use_container_width=True):
-        st.session_state.dark_mode = not st.session_state.dark_mode
-        st.rerun()
+    theme_toggle_fragment()
 
     st.markdown("---")
     if st.button("🔄 Factory Reset App", type="secondary", help="Clear all data and reset application state.", use_container_width=True):
@@ -495,42 +649,38 @@ if page == "Setup Documents":
                             st.session_state.documents_indexed = False
                             st.session_state.indexed_files = []
 
-                        # Create temporary directory for uploaded files
-                        temp_dir = tempfile.mkdtemp()
-                        loader = DocumentLoader(temp_dir)
-                        
-                        # Save uploaded files
-                        for uploaded_file in uploaded_files:
-                            file_path = os.path.join(temp_dir, uploaded_file.name)
-                            with open(file_path, 'wb') as f:
-                                f.write(uploaded_file.getbuffer())
-                        
-                        # Load and process documents
-                        documents = loader.load_all_documents()
+                        # Load and process documents in parallel (cached per file content)
+                        uploads = [(f.name, f.getbuffer().tobytes()) for f in uploaded_files]
+                        with ThreadPoolExecutor(max_workers=min(8, len(uploads))) as executor:
+                            parsed = list(executor.map(lambda upload: _parse_file(*upload), uploads))
+                        documents = [doc for doc in parsed if doc['content']] # Only keep successfully extracted content
                         
                         if not documents:
                             st.error("No documents could be loaded. Please check your files.")
                         else:
                             # Create chunks
-                            all_chunks = []
-                            for doc in documents:
-                                chunks = create_document_chunks(doc)
-                                all_chunks.extend(chunks)
+                            with ThreadPoolExecutor(max_workers=min(8, len(documents))) as executor:
+                                chunk_lists = executor.map(
+                                    lambda doc: _chunk(doc['content'], doc['filename'], doc['file_type']),
+                                    documents
+                                )
+                                all_chunks = [chunk for chunks in chunk_lists for chunk in chunks]
                             
-                            # Add to RAG pipeline
-                            st.session_state.rag_pipeline.add_documents(all_chunks)
-                            
-                            # Update session state
-                            st.session_state.documents_indexed = True
-                            if clear_existing:
-                                st.session_state.indexed_files = [f.name for f in uploaded_files]
+                            # Add to RAG pipeline (one flat list, embedded in batches)
+                            if not st.session_state.rag_pipeline.add_documents(all_chunks):
+                                st.error("Failed to index documents. Some chunks may not have been stored; please try again.")
                             else:
-                                st.session_state.indexed_files.extend([f.name for f in uploaded_files])
-                                # Remove duplicates while preserving order
-                                seen = set()
-                                st.session_state.indexed_files = [x for x in st.session_state.indexed_files if not (x in seen or seen.add(x))]
-                            
-                            st.success(f"Successfully indexed {len(all_chunks)} chunks from {len(documents)} documents!")
+                                # Update session state
+                                st.session_state.documents_indexed = True
+                                if clear_existing:
+                                    st.session_state.indexed_files = [f.name for f in uploaded_files]
+                                else:
+                                    st.session_state.indexed_files.extend([f.name for f in uploaded_files])
+                                    # Remove duplicates while preserving order
+                                    seen = set()
+                                    st.session_state.indexed_files = [x for x in st.session_state.indexed_files if not (x in seen or seen.add(x))]
+
+                                st.success(f"Successfully indexed {len(all_chunks)} chunks from {len(documents)} documents!")
                             
                     except Exception as e:
                         st.error(f"Error processing documents: {str(e)}")
@@ -622,20 +772,28 @@ elif page == "Generate Materials":
         else:
             with st.spinner("Generating your application materials... This may take a minute."):
                 try:
-                    # Use placeholder resume if not provided
-                    if not resume_content:
-                        resume_content = "Resume content not provided for ATS analysis."
-                    
-                    # Generate all materials
-                    results = st.session_state.generator.generate_all(
-                        job_description=job_description,
-                        company_name=company_name,
-                        role_title=role_title,
-                        candidate_name=candidate_name,
-                        resume_content=resume_content
-                    )
+                    # Without a pasted resume, ATS analysis rebuilds it from the uploaded documents
+                    resume_content = resume_content.strip() or None
                     
-                    st.success("All materials generated successfully!")
+                    # Generate all materials (cached for identical job details and documents)
+                    try:
+                        results = _generate_all(
+                            st.session_state.generator,
+                            job_description=job_description,
+                            company_name=company_name,
+                            role_title=role_title,
+                            candidate_name=candidate_name,
+                            resume_content=resume_content,
+                            store_version=st.session_state.rag_pipeline.store_version
+                        )
+                    except GenerationFailed as e:
+                        results = e.results
+
+                    failed = [key for key, value in results.items() if value.startswith("Error:")]
+                    for key in failed:
+                        st.error(f"Failed to generate {key.replace('_', ' ')}: {results[key]}")
+                    if not failed:
+                        st.success("All materials generated successfully!")
                     
                     # Display results in tabs
                     tab1, tab2, tab3, tab4 = st.tabs([
@@ -666,21 +824,6 @@ elif page == "Generate Materials":
         results = st.session_state.generated_results
 
         # Helper functions for downloads
-        def create_docx_download(content, filename):
-            """Create a DOCX file for download"""
-            from docx import Document
-            from io import BytesIO
-
-            doc = Document()
-            for line in content.split('\n'):
-                if line.strip():
-                    doc.add_paragraph(line)
-
-            bio = BytesIO()
-            doc.save(bio)
-            bio.seek(0)
-            return bio
-
         def create_txt_download(content):
             """Create a TXT file for download"""
             return content.encode()
@@ -689,7 +832,6 @@ elif page == "Generate Materials":
         st.markdown("""
             <style>
             .generated-content {
-                background-color: #f8f9fa;
                 padding: 20px;
                 border-radius: 10px;
                 border-left: 4px solid #1f77b4;
@@ -725,13 +867,12 @@ elif page == "Generate Materials":
         with tab1:
             st.markdown('<p class="section-header">Resume Bullet Points</p>', unsafe_allow_html=True)
 
-            # Display bullets with better formatting
-            st.markdown('<div class="generated-content">', unsafe_allow_html=True)
-            bullets = results['resume_bullets'].split('\n')
-            for bullet in bullets:
-                if bullet.strip():
-                    st.markdown(f'<div class="bullet-point">{bullet}</div>', unsafe_allow_html=True)
-            st.markdown('</div>', unsafe_allow_html=True)
+            # Display bullets with better formatting (rendered as a single element)
+            bullets_html = "".join(
+                f'<div class="bullet-point">{bullet}</div>'
+                for bullet in results['resume_bullets'].split('\n') if bullet.strip()
+            )
+            st.markdown(f'<div class="generated-content">{bullets_html}</div>', unsafe_allow_html=True)
 
             # Download buttons
             col1, col2, col3 = st.columns([1, 1, 2])
@@ -743,51 +884,56 @@ elif page == "Generate Materials":
                     mime="text/plain"
                 )
             with col2:
-                if st.button("Regenerate", key="regen_bullets"):
-                    with st.spinner("Regenerating bullets..."):
-                        try:
-                            new_bullets = st.session_state.generator.generate_resume_bullets(
-                                st.session_state.job_details['job_description'],
-                                st.session_state.job_details['candidate_name']
-                            )
-                            st.session_state.generated_results['resume_bullets'] = new_bullets
-                            st.rerun()
-                        except Exception as e:
-                            st.error(f"Error: {str(e)}")
+                with st.form("regen_bullets_form", border=False):
+                    regen_bullets = st.form_submit_button("Regenerate")
+            if regen_bullets:
+                # Stream the new text so it appears as it is generated
+                try:
+                    new_bullets = st.write_stream(st.session_state.generator.generate_resume_bullets(
+                        st.session_state.job_details['job_description'],
+                        st.session_state.job_details['candidate_name'],
+                        stream=True
+                    ))
+                    st.session_state.generated_results['resume_bullets'] = new_bullets
+                    st.rerun()
+                except Exception as e:
+                    st.error(f"Error: {str(e)}")
 
         with tab2:
             st.markdown('<p class="section-header">Cover Letter</p>', unsafe_allow_html=True)
 
-            # Display cover letter
-            st.markdown('<div class="generated-content">', unsafe_allow_html=True)
-            paragraphs = results['cover_letter'].split('\n\n')
-            for para in paragraphs:
-                if para.strip():
-                    st.markdown(f'<p style="line-height: 1.8; margin: 15px 0;">{para}</p>', unsafe_allow_html=True)
-            st.markdown('</div>', unsafe_allow_html=True)
+            # Display cover letter (rendered as a single element)
+            paragraphs_html = "".join(
+                f'<p style="line-height: 1.8; margin: 15px 0;">{para}</p>'
+                for para in results['cover_letter'].split('\n\n') if para.strip()
+            )
+            st.markdown(f'<div class="generated-content">{paragraphs_html}</div>', unsafe_allow_html=True)
 
             # Download buttons
             col1, col2, col3 = st.columns([1, 1, 2])
             with col1:
                 st.download_button(
                     label="Download DOCX",
-                    data=create_docx_download(results['cover_letter'], "cover_letter.docx"),
+                    data=_docx_bytes(results['cover_letter']),
                     file_name="cover_letter.docx",
                     mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document"
                 )
             with col2:
-                if st.button("Regenerate", key="regen_cover"):
-                    with st.spinner("Regenerating cover letter..."):
-                        try:
-                            new_cover = st.session_state.generator.generate_cover_letter(
-                                st.session_state.job_details['job_description'],
-                                st.session_state.job_details['company_name'],
-                                st.session_state.job_details['role_title']
-                            )
-                            st.session_state.generated_results['cover_letter'] = new_cover
-                            st.rerun()
-                        except Exception as e:
-                            st.error(f"Error: {str(e)}")
+                with st.form("regen_cover_form", border=False):
+                    regen_cover = st.form_submit_button("Regenerate")
+            if regen_cover:
+                # Stream the new text so it appears as it is generated
+                try:
+                    new_cover = st.write_stream(st.session_state.generator.generate_cover_letter(
+                        st.session_state.job_details['job_description'],
+                        st.session_state.job_details['company_name'],
+                        st.session_state.job_details['role_title'],
+                        stream=True
+                    ))
+                    st.session_state.generated_results['cover_letter'] = new_cover
+                    st.rerun()
+                except Exception as e:
+                    st.error(f"Error: {str(e)}")
 
         with tab3:
             st.markdown('<p class="section-header">ATS Analysis Report</p>', unsafe_allow_html=True)
@@ -805,25 +951,26 @@ elif page == "Generate Materials":
                     mime="text/plain"
                 )
             with col2:
-                if st.button("Regenerate", key="regen_ats"):
-                    with st.spinner("Regenerating ATS analysis..."):
-                        try:
-                            new_ats = st.session_state.generator.generate_ats_analysis(
-                                st.session_state.job_details['job_description'],
-                                st.session_state.job_details['resume_content']
-                            )
-                            st.session_state.generated_results['ats_analysis'] = new_ats
-                            st.rerun()
-                        except Exception as e:
-                            st.error(f"Error: {str(e)}")
+                with st.form("regen_ats_form", border=False):
+                    regen_ats = st.form_submit_button("Regenerate")
+            if regen_ats:
+                # Stream the new text so it appears as it is generated
+                try:
+                    new_ats = st.write_stream(st.session_state.generator.generate_ats_analysis(
+                        st.session_state.job_details['job_description'],
+                        st.session_state.job_details['resume_content'],
+                        stream=True
+                    ))
+                    st.session_state.generated_results['ats_analysis'] = new_ats
+                    st.rerun()
+                except Exception as e:
+                    st.error(f"Error: {str(e)}")
 
         with tab4:
             st.markdown('<p class="section-header">LinkedIn Message</p>', unsafe_allow_html=True)
 
             # Display LinkedIn message
-            st.markdown('<div class="generated-content">', unsafe_allow_html=True)
-            st.markdown(f'<p style="line-height: 1.8;">{results["linkedin_message"]}</p>', unsafe_allow_html=True)
-            st.markdown('</div>', unsafe_allow_html=True)
+            st.markdown(f'<div class="generated-content"><p style="line-height: 1.8;">{results["linkedin_message"]}</p></div>', unsafe_allow_html=True)
 
             # Download buttons
             col1, col2, col3 = st.columns([1, 1, 2])
@@ -835,15 +982,18 @@ elif page == "Generate Materials":
                     mime="text/plain"
                 )
             with col2:
-                if st.button("Regenerate", key="regen_linkedin"):
-                    with st.spinner("Regenerating LinkedIn message..."):
-                        try:
-                            new_linkedin = st.session_state.generator.generate_linkedin_message(
-                                st.session_state.job_details['job_description'],
-                                st.session_state.job_details['company_name'],
-                                st.session_state.job_details['role_title']
-                            )
-                            st.session_state.generated_results['linkedin_message'] = new_linkedin
-                            st.rerun()
-                        except Exception as e:
-                            st.error(f"Error: {str(e)}")
+                with st.form("regen_linkedin_form", border=False):
+                    regen_linkedin = st.form_submit_button("Regenerate")
+            if regen_linkedin:
+                # Stream the new text so it appears as it is generated
+                try:
+                    new_linkedin = st.write_stream(st.session_state.generator.generate_linkedin_message(
+                        st.session_state.job_details['job_description'],
+                        st.session_state.job_details['company_name'],
+                        st.session_state.job_details['role_title'],
+                        stream=True
+                    ))
+                    st.session_state.generated_results['linkedin_message'] = new_linkedin
+                    st.rerun()
+                except Exception as e:
+                    st.error(f"Error: {str(e)}")
@@ -1,6 +1,15 @@
 import os
+import mmap
 import logging
-from typing import List, Dict, Any, Optional
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from io import BytesIO
+from itertools import repeat
+from pathlib import Path
+from typing import List, Dict, Any, Optional, BinaryIO, Tuple, Union
+import diskcache
+import pypdfium2 as pdfium
 import pypdf
 import docx
 
@@ -8,22 +17,218 @@ import docx
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# File extensions load_all_documents picks up
+SUPPORTED_EXTENSIONS = ('.pdf', '.docx', '.txt')
+
+# PDFs with fewer pages than this are extracted serially; a process pool isn't worth it
+PARALLEL_PDF_MIN_PAGES = 5
+
+# Parsed documents are cached on disk next to the vector store, capped at 256 MB
+DOCUMENT_CACHE_DIR = str(Path(__file__).parent.parent / "data" / "document_cache")
+DOCUMENT_CACHE_SIZE_LIMIT = 256 * 1024 * 1024
+
+# PDFium is not thread-safe, so calls into it are serialized within a process
+_PDFIUM_LOCK = threading.Lock()
+
+# Worker processes are spawned, not forked: a fork taken while another thread holds
+# _PDFIUM_LOCK would hand the child a lock that is never released
+_POOL_CONTEXT = multiprocessing.get_context("spawn")
+
+def _get_max_workers(n_tasks: int) -> int:
+    """
+    Size a worker pool to the task count, capped at the number of CPUs.
+
+    Args:
+        n_tasks (int): Number of tasks to run.
+
+    Returns:
+        int: Number of workers to use.
+    """
+    return max(1, min(os.cpu_count() or 1, n_tasks))
+
+def _normalize_newlines(text: str) -> str:
+    """
+    Translate Windows (CRLF) and old Mac (CR) line endings to LF, as text-mode reads do.
+
+    Args:
+        text (str): Decoded text.
+
+    Returns:
+        str: The text with LF line endings only.
+    """
+    if '\r' in text:
+        text = text.replace('\r\n', '\n').replace('\r', '\n')
+    return text
+
+def _load_document_worker(file_path: str) -> Dict[str, Any]:
+    """
+    Load a single document. Module-level so it can be pickled for a process pool.
+
+    Args:
+        file_path (str): Path to the document file.
+
+    Returns:
+        dict: Dictionary with 'content', 'filename', and 'file_type'.
+    """
+    # Already running in a worker process, so don't start another pool for pages.
+    # The parent process owns the cache and stores the result.
+    return DocumentLoader(parallel_pages=False, cache_dir=None).load_document(file_path)
+
+def _pdf_page_count(source: Union[str, BinaryIO]) -> int:
+    """
+    Count the pages of a PDF, falling back to pypdf for files PDFium rejects.
+
+    Args:
+        source (str | BinaryIO): Path to the PDF file or a binary stream.
+
+    Returns:
+        int: Number of pages.
+    """
+    try:
+        with _PDFIUM_LOCK:
+            pdf = pdfium.PdfDocument(source)
+            try:
+                return len(pdf)
+            finally:
+                pdf.close()
+    except Exception as e:
+        logger.warning(f"PDFium could not open PDF ({e}), falling back to pypdf.")
+        if not isinstance(source, str):
+            source.seek(0)
+        return len(pypdf.PdfReader(source).pages)
+
+def _pdf_page_texts(source: Union[str, BinaryIO], start: int = 0, end: Optional[int] = None) -> List[str]:
+    """
+    Extract text from a range of PDF pages with PDFium, falling back to pypdf for files PDFium rejects.
+
+    Args:
+        source (str | BinaryIO): Path to the PDF file or a binary stream.
+        start (int): Index of the first page.
+        end (int, optional): Index one past the last page. Defaults to the end of the document.
+
+    Returns:
+        List[str]: Text of each page in the range.
+    """
+    try:
+        with _PDFIUM_LOCK:
+            pdf = pdfium.PdfDocument(source)
+            try:
+                texts = []
+                for i in range(start, len(pdf) if end is None else end):
+                    page = pdf[i]
+                    textpage = page.get_textpage()
+                    # PDFium separates lines with CRLF
+                    texts.append(textpage.get_text_range().replace("\r\n", "\n"))
+                    textpage.close()
+                    page.close()
+                return texts
+            finally:
+                pdf.close()
+    except Exception as e:
+        logger.warning(f"PDFium could not extract text ({e}), falling back to pypdf.")
+        if not isinstance(source, str):
+            source.seek(0)
+        reader = pypdf.PdfReader(source)
+        return [reader.pages[i].extract_text() for i in range(start, len(reader.pages) if end is None else end)]
+
+def _extract_pages(file_path: str, start: int, end: int) -> List[str]:
+    """
+    Extract text from a block of PDF pages. Module-level so it can be pickled for a process pool.
+
+    Args:
+        file_path (str): Path to the PDF file.
+        start (int): Index of the first page.
+        end (int): Index one past the last page.
+
+    Returns:
+        List[str]: Text of each page in the block.
+    """
+    return _pdf_page_texts(file_path, start, end)
+
 class DocumentLoader:
     """
     A class to load and extract text from various document formats (PDF, DOCX, TXT).
     """
 
-    def __init__(self, data_folder: str):
+    def __init__(
+        self,
+        data_folder: Optional[str] = None,
+        parallel_pages: bool = True,
+        cache_dir: Optional[str] = DOCUMENT_CACHE_DIR
+    ):
         """
         Initialize the DocumentLoader with the path to the data folder.
 
         Args:
-            data_folder (str): Path to the directory containing documents.
+            data_folder (str, optional): Path to the directory containing documents.
+                Not needed when only loading from bytes.
+            parallel_pages (bool): Extract pages of large PDFs in a process pool.
+            cache_dir (str, optional): Directory of the persistent cache of parsed documents.
+                None disables caching.
         """
         self.data_folder = data_folder
-        if not os.path.exists(data_folder):
+        self.parallel_pages = parallel_pages
+        if data_folder and not os.path.exists(data_folder):
             logger.warning(f"Data folder '{data_folder}' does not exist.")
 
+        self.cache = None
+        if cache_dir:
+            try:
+                self.cache = diskcache.Cache(cache_dir, size_limit=DOCUMENT_CACHE_SIZE_LIMIT)
+            except Exception as e:
+                logger.warning(f"Could not open document cache at '{cache_dir}' ({e}), caching disabled.")
+
+    def _cache_key(self, file_path: str) -> Optional[Tuple[str, int, int]]:
+        """
+        Build the cache key of a file. Any edit changes its mtime or size, so stale entries are never hit.
+
+        Args:
+            file_path (str): Path to the document file.
+
+        Returns:
+            tuple or None: (absolute path, mtime in ns, size), or None if caching is off or the file can't be read.
+        """
+        if self.cache is None:
+            return None
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return None
+        return (os.path.abspath(file_path), stat.st_mtime_ns, stat.st_size)
+
+    def _cache_get(self, key: Optional[Tuple[str, int, int]]) -> Optional[Dict[str, Any]]:
+        """
+        Look up a parsed document in the cache.
+
+        Args:
+            key (tuple, optional): Key from _cache_key.
+
+        Returns:
+            dict or None: The cached document data, or None on a miss.
+        """
+        if key is None:
+            return None
+        try:
+            return self.cache.get(key)
+        except Exception as e:
+            logger.warning(f"Document cache read failed: {e}")
+            return None
+
+    def _cache_set(self, key: Optional[Tuple[str, int, int]], doc_data: Dict[str, Any]) -> None:
+        """
+        Store a parsed document in the cache. Failed or empty loads are not cached.
+
+        Args:
+            key (tuple, optional): Key from _cache_key.
+            doc_data (dict): Document data from load_document.
+        """
+        if key is None or not doc_data['content']:
+            return
+        try:
+            self.cache.set(key, doc_data)
+        except Exception as e:
+            logger.warning(f"Document cache write failed: {e}")
+
     def load_pdf(self, file_path: str) -> str:
         """
         Extract text from a PDF file.
@@ -35,16 +240,53 @@ class DocumentLoader:
             str: Extracted text content.
         """
         try:
-            text = ""
-            with open(file_path, 'rb') as file:
-                reader = pypdf.PdfReader(file)
-                for page in reader.pages:
-                    text += page.extract_text() + "\n"
-            return text.strip()
+            if self.parallel_pages:
+                n_pages = _pdf_page_count(file_path)
+                if n_pages >= PARALLEL_PDF_MIN_PAGES:
+                    try:
+                        return self._read_pdf_parallel(file_path, n_pages)
+                    except Exception as e:
+                        logger.warning(f"Parallel extraction failed for '{file_path}' ({e}), extracting sequentially.")
+
+            return "\n".join(_pdf_page_texts(file_path)).strip()
         except Exception as e:
             logger.error(f"Error loading PDF '{file_path}': {e}")
             return ""
 
+    def _read_pdf_parallel(self, file_path: str, n_pages: int) -> str:
+        """
+        Extract text from a PDF with blocks of pages spread across worker processes.
+
+        Args:
+            file_path (str): Path to the PDF file.
+            n_pages (int): Number of pages in the PDF.
+
+        Returns:
+            str: Extracted text content.
+        """
+        n_workers = _get_max_workers(n_pages)
+        # One contiguous block per worker, so each worker opens the file once
+        block_size = -(-n_pages // n_workers)
+        starts = range(0, n_pages, block_size)
+        ends = [min(start + block_size, n_pages) for start in starts]
+
+        with ProcessPoolExecutor(max_workers=n_workers, mp_context=_POOL_CONTEXT) as executor:
+            blocks = executor.map(_extract_pages, repeat(file_path), starts, ends)
+            page_texts = [text for block in blocks for text in block]
+        return "\n".join(page_texts).strip()
+
+    def _read_pdf(self, stream: BinaryIO) -> str:
+        """
+        Extract text from an open PDF stream.
+
+        Args:
+            stream (BinaryIO): Binary stream positioned at the start of the PDF.
+
+        Returns:
+            str: Extracted text content.
+        """
+        return "\n".join(_pdf_page_texts(stream)).strip()
+
     def load_docx(self, file_path: str) -> str:
         """
         Extract text from a DOCX file.
@@ -56,15 +298,27 @@ class DocumentLoader:
             str: Extracted text content.
         """
         try:
-            doc = docx.Document(file_path)
-            text = []
-            for paragraph in doc.paragraphs:
-                text.append(paragraph.text)
-            return "\n".join(text).strip()
+            return self._read_docx(file_path)
         except Exception as e:
             logger.error(f"Error loading DOCX '{file_path}': {e}")
             return ""
 
+    def _read_docx(self, source: Union[str, BinaryIO]) -> str:
+        """
+        Extract text from a DOCX file path or binary stream.
+
+        Args:
+            source (str | BinaryIO): Path to the DOCX file or a binary stream.
+
+        Returns:
+            str: Extracted text content.
+        """
+        doc = docx.Document(source)
+        text = []
+        for paragraph in doc.paragraphs:
+            text.append(paragraph.text)
+        return "\n".join(text).strip()
+
     def load_txt(self, file_path: str) -> str:
         """
         Read plain text from a TXT file.
@@ -76,15 +330,42 @@ class DocumentLoader:
             str: File content.
         """
         try:
-            with open(file_path, 'r', encoding='utf-8') as file:
-                return file.read().strip()
+            with open(file_path, 'rb') as file:
+                # mmap can't map an empty file
+                if os.fstat(file.fileno()).st_size == 0:
+                    return ""
+                # Decode straight from the mapped pages, without first copying the raw bytes into memory
+                with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    text = str(mapped, 'utf-8')
+            return _normalize_newlines(text).strip()
         except Exception as e:
             logger.error(f"Error loading TXT '{file_path}': {e}")
             return ""
 
     def load_document(self, file_path: str) -> Dict[str, Any]:
         """
-        Auto-detect format and load document.
+        Auto-detect format and load document, serving unchanged files from the cache.
+
+        Args:
+            file_path (str): Path to the document file.
+
+        Returns:
+            dict: Dictionary with 'content', 'filename', and 'file_type'.
+                  Returns empty content if loading fails or format is unsupported.
+        """
+        # Key on the file as it was before parsing, so an edit mid-parse isn't cached as current
+        key = self._cache_key(file_path)
+        cached = self._cache_get(key)
+        if cached is not None:
+            return cached
+
+        doc_data = self._parse_document(file_path)
+        self._cache_set(key, doc_data)
+        return doc_data
+
+    def _parse_document(self, file_path: str) -> Dict[str, Any]:
+        """
+        Auto-detect format and parse document, bypassing the cache.
 
         Args:
             file_path (str): Path to the document file.
@@ -113,6 +394,40 @@ class DocumentLoader:
             'file_type': file_ext[1:]  # remove the dot
         }
 
+    def load_from_bytes(self, filename: str, data: bytes) -> Dict[str, Any]:
+        """
+        Load a document from in-memory bytes, e.g. an uploaded file, without writing it to disk.
+
+        Args:
+            filename (str): Original file name, used to detect the format.
+            data (bytes): Raw file content.
+
+        Returns:
+            dict: Dictionary with 'content', 'filename', and 'file_type'.
+                  Returns empty content if loading fails or format is unsupported.
+        """
+        file_ext = os.path.splitext(filename)[1].lower()
+        content = ""
+
+        try:
+            if file_ext == '.pdf':
+                content = self._read_pdf(BytesIO(data))
+            elif file_ext == '.docx':
+                content = self._read_docx(BytesIO(data))
+            elif file_ext == '.txt':
+                content = _normalize_newlines(data.decode('utf-8')).strip()
+            else:
+                logger.warning(f"Unsupported file format: {filename}")
+                return {'content': "", 'filename': filename, 'file_type': 'unknown'}
+        except Exception as e:
+            logger.error(f"Error loading '{filename}': {e}")
+
+        return {
+            'content': content,
+            'filename': filename,
+            'file_type': file_ext[1:]  # remove the dot
+        }
+
     def load_all_documents(self) -> List[Dict[str, Any]]:
         """
         Load all supported documents from the data folder.
@@ -121,18 +436,67 @@ class DocumentLoader:
             list[dict]: List of dictionaries containing document data.
         """
         documents = []
-        if not os.path.exists(self.data_folder):
+        if not self.data_folder or not os.path.exists(self.data_folder):
             logger.error(f"Data folder '{self.data_folder}' not found.")
             return documents
 
-        for filename in os.listdir(self.data_folder):
-            file_path = os.path.join(self.data_folder, filename)
-            if os.path.isfile(file_path):
-                # Check if it's a supported format before trying to load
-                if filename.lower().endswith(('.pdf', '.docx', '.txt')):
-                    doc_data = self.load_document(file_path)
-                    if doc_data['content']: # Only add if content was successfully extracted
-                        documents.append(doc_data)
-        
-        logger.info(f"Loaded {len(documents)} documents from '{self.data_folder}'.")
+        # scandir entries carry the file type from the directory listing, so no extra stat per file
+        file_paths = []
+        skipped = []
+        with os.scandir(self.data_folder) as entries:
+            for entry in entries:
+                if not entry.is_file():
+                    continue
+                if entry.name.lower().endswith(SUPPORTED_EXTENSIONS):
+                    file_paths.append(entry.path)
+                else:
+                    skipped.append(entry.name)
+
+        # Serve unchanged files from the cache; only the rest need parsing
+        keys = {path: self._cache_key(path) for path in file_paths}
+        loaded = {}
+        for path, key in keys.items():
+            cached = self._cache_get(key)
+            if cached is not None:
+                loaded[path] = cached
+        pending = [path for path in file_paths if path not in loaded]
+
+        # PDF extraction is CPU-bound pure Python, so PDFs go to a process pool.
+        # DOCX and TXT loading is mostly I/O, so threads are enough.
+        pdf_paths = [path for path in pending if path.lower().endswith('.pdf')]
+        other_paths = [path for path in pending if not path.lower().endswith('.pdf')]
+
+        if len(pdf_paths) > 1:
+            try:
+                with ProcessPoolExecutor(max_workers=_get_max_workers(len(pdf_paths)), mp_context=_POOL_CONTEXT) as executor:
+                    for path, doc_data in zip(pdf_paths, executor.map(_load_document_worker, pdf_paths)):
+                        self._cache_set(keys[path], doc_data)
+                        loaded[path] = doc_data
+            except Exception as e:
+                logger.warning(f"Parallel PDF loading failed ({e}), loading sequentially.")
+        if other_paths:
+            with ThreadPoolExecutor(max_workers=_get_max_workers(len(other_paths))) as executor:
+                loaded.update(zip(other_paths, executor.map(self.load_document, other_paths)))
+
+        # Keep directory order; anything not loaded above (a single PDF, or a failed pool) loads here
+        failed = []
+        for file_path in file_paths:
+            doc_data = loaded.get(file_path) or self.load_document(file_path)
+            if doc_data['content']: # Only add if content was successfully extracted
+                documents.append(doc_data)
+            else:
+                failed.append(doc_data['filename'])
+
+        # One summary record instead of one per file; per-file detail only when debugging
+        if logger.isEnabledFor(logging.DEBUG):
+            for doc_data in documents:
+                logger.debug(f"Loaded '{doc_data['filename']}' ({len(doc_data['content'])} characters).")
+            for filename in skipped:
+                logger.debug(f"Skipped unsupported file '{filename}'.")
+        if failed:
+            logger.warning(f"No text extracted from: {', '.join(failed)}")
+        logger.info(
+            f"Loaded {len(documents)}/{len(file_paths)} documents from '{self.data_folder}' "
+            f"(skipped={len(skipped)}, failed={len(failed)})."
+        )
         return documents
@@ -0,0 +1,118 @@
+"""
+Module for the persistent embedding cache.
+Stores document embeddings on disk so identical text is never sent to the embeddings API twice.
+"""
+
+import os
+import sqlite3
+import hashlib
+import logging
+import threading
+from pathlib import Path
+from typing import List, Optional, Sequence
+import numpy as np
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# Default location, next to the vector store
+EMBEDDING_CACHE_PATH = str(Path(__file__).parent.parent / "data" / "embedding_cache.sqlite")
+
+# Stay under SQLite's default limit on bound parameters per statement
+_MAX_QUERY_PARAMS = 900
+
+# Vectors are stored as float16; the table name carries the format so older files aren't misread
+_STORED_DTYPE = np.float16
+_TABLE = "embeddings_fp16"
+
+class EmbeddingCache:
+    """
+    A SQLite-backed map from (model, text) to its embedding vector.
+
+    Keys are a blake2b hash of the model name and text, and vectors are stored as
+    float16 bytes, half the size of float32 at well under 1e-3 cosine error for
+    unit-length embeddings. Lookups never touch the network.
+    """
+
+    def __init__(self, model: str, path: str = EMBEDDING_CACHE_PATH):
+        """
+        Initialize the EmbeddingCache.
+
+        Args:
+            model (str): Embedding model name. Vectors from different models never collide.
+            path (str): Path to the SQLite database file.
+        """
+        self.model = model
+        self.path = path
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        # Autocommit mode; writes open their own transaction
+        self._conn = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(f"CREATE TABLE IF NOT EXISTS {_TABLE} (hash BLOB PRIMARY KEY, vec BLOB NOT NULL)")
+        self._lock = threading.Lock()
+
+    def _key(self, text: str) -> bytes:
+        """
+        Hash a text together with the model name.
+
+        Args:
+            text (str): The embedded text.
+
+        Returns:
+            bytes: 16-byte cache key.
+        """
+        return hashlib.blake2b(f"{self.model}\0{text}".encode('utf-8'), digest_size=16).digest()
+
+    def get_many(self, texts: Sequence[str]) -> List[Optional[List[float]]]:
+        """
+        Look up the embeddings of several texts.
+
+        Args:
+            texts (Sequence[str]): Texts to look up.
+
+        Returns:
+            List[Optional[List[float]]]: The cached embedding of each text, or None on a miss.
+        """
+        keys = [self._key(text) for text in texts]
+        found = {}
+        with self._lock:
+            for start in range(0, len(keys), _MAX_QUERY_PARAMS):
+                batch = keys[start:start + _MAX_QUERY_PARAMS]
+                placeholders = ",".join("?" * len(batch))
+                found.update(self._conn.execute(
+                    f"SELECT hash, vec FROM {_TABLE} WHERE hash IN ({placeholders})", batch
+                ))
+        return [
+            np.frombuffer(found[key], dtype=_STORED_DTYPE).astype(np.float32).tolist() if key in found else None
+            for key in keys
+        ]
+
+    def put_many(self, texts: Sequence[str], embeddings: Sequence[Sequence[float]]) -> None:
+        """
+        Store the embeddings of several texts in a single transaction.
+
+        Args:
+            texts (Sequence[str]): The embedded texts.
+            embeddings (Sequence[Sequence[float]]): Their embeddings, aligned with texts.
+        """
+        rows = [
+            (self._key(text), np.asarray(embedding, dtype=_STORED_DTYPE).tobytes())
+            for text, embedding in zip(texts, embeddings)
+        ]
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.executemany(f"INSERT OR REPLACE INTO {_TABLE} (hash, vec) VALUES (?, ?)", rows)
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def clear(self) -> None:
+        """
+        Remove all cached embeddings.
+        """
+        with self._lock:
+            self._conn.execute(f"DELETE FROM {_TABLE}")
@@ -0,0 +1,61 @@
+"""
+Module for running coroutines from synchronous code.
+Keeps one event loop alive on a background thread, so async HTTP clients that pool
+connections are always used from the loop they were created on.
+"""
+
+import asyncio
+import logging
+import threading
+from typing import Any, Coroutine, Optional, TypeVar
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_lock = threading.Lock()
+
+def _get_loop() -> asyncio.AbstractEventLoop:
+    """
+    Return the shared background event loop, starting it on first use.
+
+    Returns:
+        asyncio.AbstractEventLoop: A loop running forever on a daemon thread.
+    """
+    global _loop
+    with _loop_lock:
+        if _loop is None or _loop.is_closed():
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name="async-runner", daemon=True).start()
+            _loop = loop
+            logger.info("Started background event loop.")
+        return _loop
+
+def run_sync(coro: Coroutine[Any, Any, T]) -> T:
+    """
+    Run a coroutine on the shared background loop and wait for its result.
+
+    Unlike asyncio.run, every call uses the same loop, so pooled async clients stay
+    usable across calls, and it also works when the caller already has a running loop.
+
+    Args:
+        coro (Coroutine): The coroutine to run.
+
+    Returns:
+        The coroutine's result. Its exceptions are raised here.
+
+    Raises:
+        RuntimeError: If called from the background loop itself, which would deadlock.
+    """
+    loop = _get_loop()
+    try:
+        running = asyncio.get_running_loop()
+    except RuntimeError:
+        running = None
+    if running is loop:
+        coro.close()
+        raise RuntimeError("run_sync cannot be called from the background event loop; await the coroutine instead.")
+    return asyncio.run_coroutine_threadsafe(coro, loop).result()
@@ -3,22 +3,66 @@ Module for the generation pipeline.
 Orchestrates RAG retrieval and LLM generation for job application materials.
 """
 
+import asyncio
 import logging
-from typing import Dict, List, Any
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
+import httpx
+import numpy as np
+import openai
+import tiktoken
 from langchain_openai import ChatOpenAI
+from tenacity import AsyncRetrying, retry_if_exception_type, stop_after_attempt, wait_random_exponential
 from .prompt_templates import get_prompt
 from .rag_pipeline import RAGPipeline
+from .semantic_cache import SemanticCache
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+class RetrievalError(Exception):
+    """Raised when background context could not be retrieved, as opposed to there being none."""
+
 class JobApplicationGenerator:
     """
     A class to generate job application materials using RAG and LLM.
     """
 
-    def __init__(self, rag_pipeline: RAGPipeline, openai_api_key: str, model: str = "gpt-3.5-turbo"):
+    # Maximum number of memoized vector searches and query embeddings
+    SEARCH_MEMO_SIZE = 512
+
+    # Query used to rebuild the resume from the vector store for ATS analysis
+    ATS_RESUME_QUERY = "resume work experience projects skills education background"
+
+    # Transient OpenAI errors worth retrying when the four calls of agenerate_all
+    # hit rate limits together, and how many attempts each call gets
+    RETRYABLE_ERRORS = (
+        openai.RateLimitError,
+        openai.APITimeoutError,
+        openai.APIConnectionError,
+        openai.InternalServerError
+    )
+    MAX_ATTEMPTS = 4
+
+    # Retrieved chunks this similar to one already in the context are dropped,
+    # and the context is trimmed to this many tokens
+    CONTEXT_DEDUP_THRESHOLD = 0.95
+    CONTEXT_TOKEN_BUDGET = 2500
+
+    # Idle connections kept open to the API, enough for generate_all's four threads
+    MAX_KEEPALIVE_CONNECTIONS = 10
+
+    def __init__(
+        self,
+        rag_pipeline: RAGPipeline,
+        openai_api_key: str,
+        model: str = "gpt-3.5-turbo",
+        semantic_cache: Optional[SemanticCache] = None,
+        use_semantic_cache: bool = True
+    ):
         """
         Initialize the JobApplicationGenerator.
 
@@ -26,15 +70,130 @@ class JobApplicationGenerator:
             rag_pipeline (RAGPipeline): The RAG pipeline instance for context retrieval.
             openai_api_key (str): OpenAI API key.
             model (str): The ChatGPT model to use (default: gpt-3.5-turbo).
+            semantic_cache (SemanticCache, optional): Cache for generated outputs. Defaults to a new SemanticCache.
+            use_semantic_cache (bool): Whether to reuse outputs for similar job descriptions.
         """
         self.rag_pipeline = rag_pipeline
+        # One connection pool for the generator's lifetime, so sync calls reuse warm TLS connections
+        self.http_client = httpx.Client(
+            limits=httpx.Limits(max_keepalive_connections=self.MAX_KEEPALIVE_CONNECTIONS)
+        )
         self.llm = ChatOpenAI(
             model=model,
             temperature=0.7,
-            openai_api_key=openai_api_key
+            openai_api_key=openai_api_key,
+            http_client=self.http_client
         )
+        # The async path retries with jittered backoff itself (see _agenerate), so its
+        # client must not retry too; sync calls and streams keep the built-in retries
+        self.async_llm = ChatOpenAI(
+            model=model,
+            temperature=0.7,
+            openai_api_key=openai_api_key,
+            max_retries=0
+        )
+        if use_semantic_cache:
+            self.cache = semantic_cache if semantic_cache is not None else SemanticCache()
+        else:
+            self.cache = None
+        self._search_memo: "OrderedDict[Tuple[str, int, int], List[Dict[str, Any]]]" = OrderedDict()
+        self._embedding_memo: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._search_lock = threading.Lock()
+        try:
+            self._encoding = tiktoken.encoding_for_model(model)
+        except Exception as e:
+            # tiktoken downloads its BPE files on first use; estimate tokens if that's not possible
+            logger.warning(f"Could not load tokenizer for {model} ({e}), estimating context tokens from length.")
+            self._encoding = None
         logger.info(f"JobApplicationGenerator initialized with model: {model}")
 
+    def _embed_queries(self, queries: List[str]) -> List[List[float]]:
+        """
+        Embed query strings, reusing earlier embeddings and sending all new ones in a single request.
+
+        Args:
+            queries (List[str]): Query strings to embed.
+
+        Returns:
+            List[List[float]]: One embedding per query, in order.
+        """
+        with self._search_lock:
+            missing = [query for query in dict.fromkeys(queries) if query not in self._embedding_memo]
+
+        if missing:
+            embeddings = self.rag_pipeline.embed_queries(missing)
+            with self._search_lock:
+                self._embedding_memo.update(zip(missing, embeddings))
+                while len(self._embedding_memo) > self.SEARCH_MEMO_SIZE:
+                    self._embedding_memo.popitem(last=False)
+                found = {query: self._embedding_memo.get(query) for query in queries}
+            # Entries evicted by a concurrent caller fall back to this call's embeddings
+            found.update((query, embedding) for query, embedding in zip(missing, embeddings) if found[query] is None)
+        else:
+            with self._search_lock:
+                found = {query: self._embedding_memo[query] for query in queries}
+        return [found[query] for query in queries]
+
+    def _prefetch_contexts(self, job_description: str, resume_content: Optional[str]) -> None:
+        """
+        Embed every query a full generation needs in one request and run its searches,
+        so the four generators only hit memoized results.
+
+        Args:
+            job_description (str): The job description.
+            resume_content (str, optional): The candidate's resume content, or None to retrieve it.
+        """
+        queries = [job_description]
+        if resume_content is None:
+            queries.append(self.ATS_RESUME_QUERY)
+        try:
+            self._embed_queries(queries)
+        except Exception as e:
+            logger.warning(f"Could not prefetch query embeddings: {e}")
+            return
+
+        self._search(job_description, n_results=5)
+        self._search(job_description, n_results=1)
+        if resume_content is None:
+            self._search(self.ATS_RESUME_QUERY, n_results=10)
+
+    def _search(self, query: str, n_results: int) -> List[Dict[str, Any]]:
+        """
+        Search the RAG pipeline, reusing results for repeated queries until the vector store changes.
+
+        Args:
+            query (str): The query string. Case and whitespace are ignored for reuse.
+            n_results (int): Number of results to retrieve.
+
+        Returns:
+            List[Dict[str, Any]]: Search results from the RAG pipeline.
+
+        Raises:
+            RetrievalError: If the query could not be embedded or the search failed.
+        """
+        key = (" ".join(query.lower().split()), n_results, self.rag_pipeline.store_version)
+        with self._search_lock:
+            if key in self._search_memo:
+                self._search_memo.move_to_end(key)
+                return self._search_memo[key]
+
+        try:
+            query_embedding = self._embed_queries([query])[0]
+            results = self.rag_pipeline.search_by_embedding(
+                query_embedding, n_results=n_results, include_embeddings=True, raise_errors=True
+            )
+        except Exception as e:
+            logger.error(f"Search failed: {e}")
+            raise RetrievalError(f"Could not retrieve background information: {e}") from e
+
+        # Don't memoize empty results; documents may be indexed soon
+        if results:
+            with self._search_lock:
+                self._search_memo[key] = results
+                if len(self._search_memo) > self.SEARCH_MEMO_SIZE:
+                    self._search_memo.popitem(last=False)
+        return results
+
     def _retrieve_context(self, query: str, n_results: int = 3) -> str:
         """
         Retrieve relevant context from the RAG pipeline.
@@ -46,46 +205,302 @@ class JobApplicationGenerator:
         Returns:
             str: Concatenated context from retrieved chunks.
         """
+        return self._retrieve_context_with_ids(query, n_results)[0]
+
+    def _retrieve_context_with_ids(self, query: str, n_results: int = 3) -> Tuple[str, List[str]]:
+        """
+        Retrieve relevant context and the IDs of the chunks it was built from.
+
+        Args:
+            query (str): The query string.
+            n_results (int): Number of results to retrieve.
+
+        Returns:
+            Tuple[str, List[str]]: Concatenated context and the retrieved chunk IDs.
+
+        Raises:
+            RetrievalError: If retrieval failed. An empty vector store is not an error.
+        """
+        results = self._search(query, n_results=n_results)
+        if not results:
+            logger.warning("No context retrieved from RAG pipeline.")
+            return "No relevant background information available.", []
+
+        results = self._select_context(results)
+        context_parts = [result['text'] for result in results]
+        return "\n\n".join(context_parts), [result['id'] for result in results]
+
+    def _select_context(self, results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Drop near-duplicate chunks and trim the rest to the context token budget, keeping rank order.
+
+        Args:
+            results (List[Dict[str, Any]]): Search results, best match first.
+
+        Returns:
+            List[Dict[str, Any]]: The chunks to put in the prompt.
+        """
+        selected = []
+        kept_vectors = []
+        used_tokens = 0
+        for result in results:
+            embedding = result.get('embedding')
+            if embedding is not None:
+                vector = np.asarray(embedding, dtype=np.float32)
+                norm = np.linalg.norm(vector)
+                if norm:
+                    vector = vector / norm
+                if kept_vectors and float(np.max(np.stack(kept_vectors) @ vector)) >= self.CONTEXT_DEDUP_THRESHOLD:
+                    continue
+                kept_vectors.append(vector)
+
+            n_tokens = self._count_tokens(result['text'])
+            if used_tokens + n_tokens > self.CONTEXT_TOKEN_BUDGET:
+                if not selected:
+                    # Never return an empty context; cut the best chunk down to the budget instead
+                    selected.append(dict(result, text=self._truncate_tokens(result['text'], self.CONTEXT_TOKEN_BUDGET)))
+                break
+            selected.append(result)
+            used_tokens += n_tokens
+
+        if len(selected) < len(results):
+            logger.info(f"Using {len(selected)} of {len(results)} retrieved chunks after deduplication and token budget.")
+        return selected
+
+    def _count_tokens(self, text: str) -> int:
+        """
+        Count the tokens of a text, or estimate them at 4 characters per token without a tokenizer.
+
+        Args:
+            text (str): The text to measure.
+
+        Returns:
+            int: Number of tokens.
+        """
+        if self._encoding is None:
+            return len(text) // 4 + 1
+        return len(self._encoding.encode(text))
+
+    def _truncate_tokens(self, text: str, max_tokens: int) -> str:
+        """
+        Cut a text down to at most max_tokens tokens.
+
+        Args:
+            text (str): The text to truncate.
+            max_tokens (int): Maximum number of tokens to keep.
+
+        Returns:
+            str: The truncated text.
+        """
+        if self._encoding is None:
+            return text[:max_tokens * 4]
+        return self._encoding.decode(self._encoding.encode(text)[:max_tokens])
+
+    def _embed_for_cache(self, job_description: str) -> Optional[List[float]]:
+        """
+        Embed the job description for semantic cache lookups.
+
+        Args:
+            job_description (str): The job description.
+
+        Returns:
+            List[float] or None: The embedding, or None if caching is off or embedding failed.
+        """
+        if self.cache is None:
+            return None
         try:
-            results = self.rag_pipeline.search_similar(query, n_results=n_results)
-            if not results:
-                logger.warning("No context retrieved from RAG pipeline.")
-                return "No relevant background information available."
-            
-            context_parts = [result['text'] for result in results]
-            return "\n\n".join(context_parts)
+            return self._embed_queries([job_description])[0]
         except Exception as e:
-            logger.error(f"Error retrieving context: {e}")
-            return "Error retrieving background information."
+            logger.warning(f"Could not embed job description for the semantic cache: {e}")
+            return None
+
+    def _invoke(
+        self,
+        prompt_type: str,
+        cache_key: Tuple[str, ...],
+        embedding: Optional[List[float]],
+        chunk_ids: List[str],
+        prompt: str
+    ) -> str:
+        """
+        Run an LLM call, serving it from the semantic cache when possible.
+
+        Args:
+            prompt_type (str): The prompt type, e.g. "cover_letter".
+            cache_key (tuple): Inputs that must match exactly for a cache hit. The vector
+                store version is added to it.
+            embedding (List[float], optional): Job description embedding; None skips the cache.
+            chunk_ids (List[str]): IDs of the chunks the prompt was built from.
+            prompt (str): The formatted prompt.
+
+        Returns:
+            str: Generated text.
+        """
+        return self._cached(
+            prompt_type, cache_key, embedding, chunk_ids,
+            lambda: self.llm.invoke(prompt).content
+        )
+
+    def _cached(
+        self,
+        prompt_type: str,
+        cache_key: Tuple[str, ...],
+        embedding: Optional[List[float]],
+        chunk_ids: List[str],
+        call: Callable[[], Any]
+    ) -> Any:
+        """
+        Serve an output from the semantic cache, or produce it with call and cache it.
+
+        Args:
+            prompt_type (str): The prompt type, e.g. "cover_letter".
+            cache_key (tuple): Inputs that must match exactly for a cache hit. The vector
+                store version is added to it.
+            embedding (List[float], optional): Job description embedding; None skips the cache.
+            chunk_ids (List[str]): IDs of the chunks the prompt was built from.
+            call (Callable): Produces the output on a miss. If it is a coroutine function,
+                a coroutine is returned and the output is cached once it is awaited.
+
+        Returns:
+            str, or a coroutine returning str when call is a coroutine function.
+        """
+        # Chunk IDs survive re-indexing an edited file under the same name, so the store
+        # version is part of the key and outputs never outlive the evidence they came from
+        cache_key = (*cache_key, self.rag_pipeline.store_version)
+        cached = None
+        if embedding is not None:
+            cached = self.cache.get(prompt_type, cache_key, embedding, chunk_ids)
+
+        def store(result: str) -> str:
+            if embedding is not None:
+                self.cache.put(prompt_type, cache_key, embedding, chunk_ids, result)
+            return result
+
+        if asyncio.iscoroutinefunction(call):
+            async def run() -> str:
+                return cached if cached is not None else store(await call())
+            return run()
+        return cached if cached is not None else store(call())
+
+    def _build_resume_bullets_prompt(self, job_description: str, candidate_name: str) -> Tuple[str, List[str]]:
+        """
+        Retrieve context and format the resume bullets prompt.
+
+        Args:
+            job_description (str): The job description.
+            candidate_name (str): The candidate's name.
+
+        Returns:
+            Tuple[str, List[str]]: Formatted prompt and the retrieved chunk IDs.
+        """
+        context, chunk_ids = self._retrieve_context_with_ids(job_description, n_results=5)
+        prompt = get_prompt(
+            "resume_bullets",
+            job_description=job_description,
+            context=context,
+            name=candidate_name
+        )
+        return prompt, chunk_ids
+
+    def _build_cover_letter_prompt(self, job_description: str, company_name: str, role_title: str) -> Tuple[str, List[str]]:
+        """
+        Retrieve context and format the cover letter prompt.
+
+        Args:
+            job_description (str): The job description.
+            company_name (str): The company name.
+            role_title (str): The role title.
 
-    def generate_resume_bullets(self, job_description: str, candidate_name: str) -> str:
+        Returns:
+            Tuple[str, List[str]]: Formatted prompt and the retrieved chunk IDs.
+        """
+        context, chunk_ids = self._retrieve_context_with_ids(job_description, n_results=5)
+        prompt = get_prompt(
+            "cover_letter",
+            job_description=job_description,
+            company_name=company_name,
+            role_title=role_title,
+            context=context
+        )
+        return prompt, chunk_ids
+
+    def _build_ats_analysis_prompt(self, job_description: str, resume_content: Optional[str] = None) -> Tuple[str, List[str]]:
+        """
+        Format the ATS analysis prompt, retrieving resume content if none is provided.
+
+        Args:
+            job_description (str): The job description.
+            resume_content (str, optional): The candidate's resume content. None retrieves it from the uploaded documents.
+
+        Returns:
+            Tuple[str, List[str]]: Formatted prompt and the retrieved chunk IDs (empty if resume content was provided).
+        """
+        chunk_ids = []
+        # If no resume content provided, retrieve from RAG pipeline
+        if resume_content is None:
+            logger.info("No resume content provided, retrieving from RAG pipeline...")
+            # Retrieve comprehensive context from uploaded documents
+            resume_content, chunk_ids = self._retrieve_context_with_ids(
+                self.ATS_RESUME_QUERY, 
+                n_results=10  # Get more chunks to build complete resume picture
+            )
+            logger.info(f"Retrieved resume content from RAG pipeline: {len(resume_content)} characters")
+        
+        prompt = get_prompt(
+            "ats_analysis",
+            job_description=job_description,
+            resume_content=resume_content
+        )
+        return prompt, chunk_ids
+
+    def _build_linkedin_message_prompt(self, job_description: str, company_name: str, role_title: str) -> Tuple[str, List[str]]:
+        """
+        Retrieve one key achievement and format the LinkedIn message prompt.
+
+        Args:
+            job_description (str): The job description.
+            company_name (str): The company name.
+            role_title (str): The role title.
+
+        Returns:
+            Tuple[str, List[str]]: Formatted prompt and the retrieved chunk IDs.
+        """
+        results = self._search(job_description, n_results=1)
+        achievement = results[0]['text'] if results else "relevant experience in the field"
+        prompt = get_prompt(
+            "linkedin_message",
+            job_description=job_description,
+            company_name=company_name,
+            role_title=role_title,
+            achievement=achievement
+        )
+        return prompt, [result['id'] for result in results]
+
+    def generate_resume_bullets(self, job_description: str, candidate_name: str, stream: bool = False) -> Union[str, Iterator[str]]:
         """
         Generate tailored resume bullet points.
 
         Args:
             job_description (str): The job description.
             candidate_name (str): The candidate's name.
+            stream (bool): Return an iterator of text chunks instead of the full text.
+                           Streams bypass the semantic cache.
 
         Returns:
-            str: Generated resume bullet points.
+            str | Iterator[str]: Generated resume bullet points, or its text chunks when streaming.
         """
+        if stream:
+            return self.stream_resume_bullets(job_description, candidate_name)
+
         try:
             logger.info("Generating resume bullets...")
-            
-            # Retrieve relevant context
-            context = self._retrieve_context(job_description, n_results=5)
-            
-            # Format prompt
-            prompt = get_prompt(
-                "resume_bullets",
-                job_description=job_description,
-                context=context,
-                name=candidate_name
-            )
+            prompt, chunk_ids = self._build_resume_bullets_prompt(job_description, candidate_name)
             
             # Generate with LLM
-            response = self.llm.invoke(prompt)
-            result = response.content
+            result = self._invoke(
+                "resume_bullets", (candidate_name,),
+                self._embed_for_cache(job_description), chunk_ids, prompt
+            )
             
             logger.info("Resume bullets generated successfully.")
             return result
@@ -93,7 +508,7 @@ class JobApplicationGenerator:
             logger.error(f"Error generating resume bullets: {e}")
             return f"Error: {str(e)}"
 
-    def generate_cover_letter(self, job_description: str, company_name: str, role_title: str) -> str:
+    def generate_cover_letter(self, job_description: str, company_name: str, role_title: str, stream: bool = False) -> Union[str, Iterator[str]]:
         """
         Generate a personalized cover letter.
 
@@ -101,28 +516,24 @@ class JobApplicationGenerator:
             job_description (str): The job description.
             company_name (str): The company name.
             role_title (str): The role title.
+            stream (bool): Return an iterator of text chunks instead of the full text.
+                           Streams bypass the semantic cache.
 
         Returns:
-            str: Generated cover letter.
+            str | Iterator[str]: Generated cover letter, or its text chunks when streaming.
         """
+        if stream:
+            return self.stream_cover_letter(job_description, company_name, role_title)
+
         try:
             logger.info("Generating cover letter...")
-            
-            # Retrieve relevant context
-            context = self._retrieve_context(job_description, n_results=5)
-            
-            # Format prompt
-            prompt = get_prompt(
-                "cover_letter",
-                job_description=job_description,
-                company_name=company_name,
-                role_title=role_title,
-                context=context
-            )
+            prompt, chunk_ids = self._build_cover_letter_prompt(job_description, company_name, role_title)
             
             # Generate with LLM
-            response = self.llm.invoke(prompt)
-            result = response.content
+            result = self._invoke(
+                "cover_letter", (company_name, role_title),
+                self._embed_for_cache(job_description), chunk_ids, prompt
+            )
             
             logger.info("Cover letter generated successfully.")
             return result
@@ -130,40 +541,31 @@ class JobApplicationGenerator:
             logger.error(f"Error generating cover letter: {e}")
             return f"Error: {str(e)}"
 
-    def generate_ats_analysis(self, job_description: str, resume_content: str = "") -> str:
+    def generate_ats_analysis(self, job_description: str, resume_content: Optional[str] = None, stream: bool = False) -> Union[str, Iterator[str]]:
         """
         Generate ATS analysis comparing resume to job description.
 
         Args:
             job_description (str): The job description.
-            resume_content (str): The candidate's resume content (optional).
+            resume_content (str, optional): The candidate's resume content. None retrieves it from the uploaded documents.
+            stream (bool): Return an iterator of text chunks instead of the full text.
+                           Streams bypass the semantic cache.
 
         Returns:
-            str: ATS analysis report.
+            str | Iterator[str]: ATS analysis report, or its text chunks when streaming.
         """
+        if stream:
+            return self.stream_ats_analysis(job_description, resume_content)
+
         try:
             logger.info("Generating ATS analysis...")
-            
-            # If no resume content provided, retrieve from RAG pipeline
-            if not resume_content or resume_content.strip() == "" or resume_content == "Resume content not provided for ATS analysis.":
-                logger.info("No resume content provided, retrieving from RAG pipeline...")
-                # Retrieve comprehensive context from uploaded documents
-                resume_content = self._retrieve_context(
-                    "resume work experience projects skills education background", 
-                    n_results=10  # Get more chunks to build complete resume picture
-                )
-                logger.info(f"Retrieved resume content from RAG pipeline: {len(resume_content)} characters")
-            
-            # Format prompt
-            prompt = get_prompt(
-                "ats_analysis",
-                job_description=job_description,
-                resume_content=resume_content
-            )
+            prompt, chunk_ids = self._build_ats_analysis_prompt(job_description, resume_content)
             
             # Generate with LLM
-            response = self.llm.invoke(prompt)
-            result = response.content
+            result = self._invoke(
+                "ats_analysis", (resume_content,),
+                self._embed_for_cache(job_description), chunk_ids, prompt
+            )
             
             logger.info("ATS analysis generated successfully.")
             return result
@@ -171,7 +573,7 @@ class JobApplicationGenerator:
             logger.error(f"Error generating ATS analysis: {e}")
             return f"Error: {str(e)}"
 
-    def generate_linkedin_message(self, job_description: str, company_name: str, role_title: str) -> str:
+    def generate_linkedin_message(self, job_description: str, company_name: str, role_title: str, stream: bool = False) -> Union[str, Iterator[str]]:
         """
         Generate a personalized LinkedIn message.
 
@@ -179,29 +581,24 @@ class JobApplicationGenerator:
             job_description (str): The job description.
             company_name (str): The company name.
             role_title (str): The role title.
+            stream (bool): Return an iterator of text chunks instead of the full text.
+                           Streams bypass the semantic cache.
 
         Returns:
-            str: Generated LinkedIn message.
+            str | Iterator[str]: Generated LinkedIn message, or its text chunks when streaming.
         """
+        if stream:
+            return self.stream_linkedin_message(job_description, company_name, role_title)
+
         try:
             logger.info("Generating LinkedIn message...")
-            
-            # Retrieve one key achievement
-            results = self.rag_pipeline.search_similar(job_description, n_results=1)
-            achievement = results[0]['text'] if results else "relevant experience in the field"
-            
-            # Format prompt
-            prompt = get_prompt(
-                "linkedin_message",
-                job_description=job_description,
-                company_name=company_name,
-                role_title=role_title,
-                achievement=achievement
-            )
+            prompt, chunk_ids = self._build_linkedin_message_prompt(job_description, company_name, role_title)
             
             # Generate with LLM
-            response = self.llm.invoke(prompt)
-            result = response.content
+            result = self._invoke(
+                "linkedin_message", (company_name, role_title),
+                self._embed_for_cache(job_description), chunk_ids, prompt
+            )
             
             logger.info("LinkedIn message generated successfully.")
             return result
@@ -209,13 +606,89 @@ class JobApplicationGenerator:
             logger.error(f"Error generating LinkedIn message: {e}")
             return f"Error: {str(e)}"
 
+    def _stream_llm(self, prompt: str) -> Iterator[str]:
+        """
+        Stream an LLM completion as text deltas. Streams always produce a fresh
+        output and bypass the semantic cache.
+
+        Args:
+            prompt (str): The formatted prompt.
+
+        Yields:
+            str: Chunks of generated text as they arrive.
+        """
+        for chunk in self.llm.stream(prompt):
+            yield chunk.content
+
+    def stream_resume_bullets(self, job_description: str, candidate_name: str) -> Iterator[str]:
+        """
+        Stream tailored resume bullet points.
+
+        Args:
+            job_description (str): The job description.
+            candidate_name (str): The candidate's name.
+
+        Returns:
+            Iterator[str]: Generated text chunks.
+        """
+        logger.info("Streaming resume bullets...")
+        prompt, _ = self._build_resume_bullets_prompt(job_description, candidate_name)
+        return self._stream_llm(prompt)
+
+    def stream_cover_letter(self, job_description: str, company_name: str, role_title: str) -> Iterator[str]:
+        """
+        Stream a personalized cover letter.
+
+        Args:
+            job_description (str): The job description.
+            company_name (str): The company name.
+            role_title (str): The role title.
+
+        Returns:
+            Iterator[str]: Generated text chunks.
+        """
+        logger.info("Streaming cover letter...")
+        prompt, _ = self._build_cover_letter_prompt(job_description, company_name, role_title)
+        return self._stream_llm(prompt)
+
+    def stream_ats_analysis(self, job_description: str, resume_content: Optional[str] = None) -> Iterator[str]:
+        """
+        Stream an ATS analysis comparing resume to job description.
+
+        Args:
+            job_description (str): The job description.
+            resume_content (str, optional): The candidate's resume content. None retrieves it from the uploaded documents.
+
+        Returns:
+            Iterator[str]: Generated text chunks.
+        """
+        logger.info("Streaming ATS analysis...")
+        prompt, _ = self._build_ats_analysis_prompt(job_description, resume_content)
+        return self._stream_llm(prompt)
+
+    def stream_linkedin_message(self, job_description: str, company_name: str, role_title: str) -> Iterator[str]:
+        """
+        Stream a personalized LinkedIn message.
+
+        Args:
+            job_description (str): The job description.
+            company_name (str): The company name.
+            role_title (str): The role title.
+
+        Returns:
+            Iterator[str]: Generated text chunks.
+        """
+        logger.info("Streaming LinkedIn message...")
+        prompt, _ = self._build_linkedin_message_prompt(job_description, company_name, role_title)
+        return self._stream_llm(prompt)
+
     def generate_all(
         self,
         job_description: str,
         company_name: str,
         role_title: str,
         candidate_name: str,
-        resume_content: str
+        resume_content: Optional[str] = None
     ) -> Dict[str, str]:
         """
         Generate all job application materials.
@@ -225,16 +698,115 @@ class JobApplicationGenerator:
             company_name (str): The company name.
             role_title (str): The role title.
             candidate_name (str): The candidate's name.
-            resume_content (str): The candidate's resume content.
+            resume_content (str, optional): The candidate's resume content. None retrieves it for ATS analysis.
 
         Returns:
             Dict[str, str]: Dictionary with all generated outputs.
         """
         logger.info("Generating all job application materials...")
-        
-        return {
-            "resume_bullets": self.generate_resume_bullets(job_description, candidate_name),
-            "cover_letter": self.generate_cover_letter(job_description, company_name, role_title),
-            "ats_analysis": self.generate_ats_analysis(job_description, resume_content),
-            "linkedin_message": self.generate_linkedin_message(job_description, company_name, role_title)
+
+        # Embed and search once up front so the threads below share the results
+        self._prefetch_contexts(job_description, resume_content)
+
+        tasks = {
+            "resume_bullets": (self.generate_resume_bullets, (job_description, candidate_name)),
+            "cover_letter": (self.generate_cover_letter, (job_description, company_name, role_title)),
+            "ats_analysis": (self.generate_ats_analysis, (job_description, resume_content)),
+            "linkedin_message": (self.generate_linkedin_message, (job_description, company_name, role_title))
         }
+
+        # The LLM calls are network-bound, so threads overlap them
+        with ThreadPoolExecutor(max_workers=len(tasks)) as executor:
+            futures = {key: executor.submit(fn, *args) for key, (fn, args) in tasks.items()}
+            return {key: future.result() for key, future in futures.items()}
+
+    async def _agenerate(
+        self,
+        prompt_type: str,
+        cache_key: Tuple[str, ...],
+        embedding: Optional[List[float]],
+        chunk_ids: List[str],
+        prompt: str
+    ) -> str:
+        """
+        Run a single LLM call asynchronously, serving it from the semantic cache when possible.
+        Rate limits and other transient errors are retried with jittered exponential backoff.
+
+        Args:
+            prompt_type (str): The prompt type, e.g. "cover_letter".
+            cache_key (tuple): Inputs that must match exactly for a cache hit. The vector
+                store version is added to it.
+            embedding (List[float], optional): Job description embedding; None skips the cache.
+            chunk_ids (List[str]): IDs of the chunks the prompt was built from.
+            prompt (str): The formatted prompt.
+
+        Returns:
+            str: Generated text.
+        """
+        async def call() -> str:
+            async for attempt in AsyncRetrying(
+                retry=retry_if_exception_type(self.RETRYABLE_ERRORS),
+                wait=wait_random_exponential(multiplier=1, max=20),
+                stop=stop_after_attempt(self.MAX_ATTEMPTS),
+                reraise=True
+            ):
+                with attempt:
+                    response = await self.async_llm.ainvoke(prompt)
+            return response.content
+
+        return await self._cached(prompt_type, cache_key, embedding, chunk_ids, call)
+
+    async def agenerate_all(
+        self,
+        job_description: str,
+        company_name: str,
+        role_title: str,
+        candidate_name: str,
+        resume_content: Optional[str] = None
+    ) -> Dict[str, str]:
+        """
+        Generate all job application materials with the four LLM calls in flight at once.
+
+        Args:
+            job_description (str): The job description.
+            company_name (str): The company name.
+            role_title (str): The role title.
+            candidate_name (str): The candidate's name.
+            resume_content (str, optional): The candidate's resume content. None retrieves it for ATS analysis.
+
+        Returns:
+            Dict[str, str]: Dictionary with all generated outputs. Failed entries
+                            contain an "Error: ..." message.
+        """
+        logger.info("Generating all job application materials concurrently...")
+
+        def prepare():
+            self._prefetch_contexts(job_description, resume_content)
+            embedding = self._embed_for_cache(job_description)
+            requests = {
+                "resume_bullets": ((candidate_name,), self._build_resume_bullets_prompt(job_description, candidate_name)),
+                "cover_letter": ((company_name, role_title), self._build_cover_letter_prompt(job_description, company_name, role_title)),
+                "ats_analysis": ((resume_content,), self._build_ats_analysis_prompt(job_description, resume_content)),
+                "linkedin_message": ((company_name, role_title), self._build_linkedin_message_prompt(job_description, company_name, role_title))
+            }
+            return embedding, requests
+
+        # Retrieval is blocking I/O; keep it off the event loop, which other callers share
+        embedding, requests = await asyncio.to_thread(prepare)
+
+        responses = await asyncio.gather(
+            *(
+                self._agenerate(key, cache_key, embedding, chunk_ids, prompt)
+                for key, (cache_key, (prompt, chunk_ids)) in requests.items()
+            ),
+            return_exceptions=True
+        )
+
+        results = {}
+        for key, response in zip(requests, responses):
+            if isinstance(response, Exception):
+                logger.error(f"Error generating {key}: {response}")
+                results[key] = f"Error: {str(response)}"
+            else:
+                results[key] = response
+        return results
@@ -3,18 +3,13 @@ Module containing prompt templates for the LLM.
 Defines the structure of prompts used for various tasks within the assistant.
 """
 
+from string import Formatter
+from typing import List, Optional, Tuple
+
 RESUME_BULLET_PROMPT = """You are an expert resume writer specializing in creating impactful, ATS-optimized resume bullet points.
 
 **Task**: Analyze the candidate's entire resume and rewrite ALL bullet points for each work experience and project. Make them clear, concise, ATS-friendly, and tailored to the job description. Maintain the same number of bullets as the original for each item.
 
-**Job Description**:
-{job_description}
-
-**Candidate's Full Resume Content**:
-{context}
-
-**Candidate's Name**: {name}
-
 **Instructions**:
 1. **Analyze the entire resume** to identify:
    - All work experiences (internships, jobs, roles) with their titles
@@ -85,21 +80,21 @@ Financial Portfolio Risk Analytics Dashboard:
 • Analyzed 5-year historical data for 15-asset portfolio using efficient frontier calculations and Sharpe ratio metrics
 • Developed Monte Carlo simulation (1,000 iterations) projecting 87% confidence of 10%+ returns over 5 years
 • Built Power BI dashboard with dynamic asset allocation visualization tracking portfolio performance in real-time
-"""
 
-COVER_LETTER_PROMPT = """You are a professional cover letter writer who creates personalized, compelling cover letters.
-
-**Task**: Write a 3-4 paragraph professional cover letter tailored to the specific job and company.
+**Request Details**:
 
 **Job Description**:
 {job_description}
 
-**Company Name**: {company_name}
+**Candidate's Full Resume Content**:
+{context}
 
-**Role Title**: {role_title}
+**Candidate's Name**: {name}
+"""
 
-**Candidate's Relevant Experience/Context**:
-{context}
+COVER_LETTER_PROMPT = """You are a professional cover letter writer who creates personalized, compelling cover letters.
+
+**Task**: Write a 3-4 paragraph professional cover letter tailored to the specific job and company.
 
 **Instructions**:
 1. **Opening Paragraph**: Express enthusiasm for the role and company. Briefly mention why this specific position interests you and how you learned about it.
@@ -111,17 +106,23 @@ COVER_LETTER_PROMPT = """You are a professional cover letter writer who creates
 
 **Output Format**:
 Return the cover letter text with proper paragraph breaks. Do NOT include the header (address, date, etc.) or signature block - just the body paragraphs.
-"""
 
-ATS_ANALYSIS_PROMPT = """You are an ATS (Applicant Tracking System) expert who analyzes resume-job description alignment.
-
-**Task**: Analyze the candidate's resume against the job description and provide a focused ATS compatibility report with a numeric score. You MUST always provide a numeric percentage score, never N/A.
+**Request Details**:
 
 **Job Description**:
 {job_description}
 
-**Candidate's Resume Content**:
-{resume_content}
+**Company Name**: {company_name}
+
+**Role Title**: {role_title}
+
+**Candidate's Relevant Experience/Context**:
+{context}
+"""
+
+ATS_ANALYSIS_PROMPT = """You are an ATS (Applicant Tracking System) expert who analyzes resume-job description alignment.
+
+**Task**: Analyze the candidate's resume against the job description and provide a focused ATS compatibility report with a numeric score. You MUST always provide a numeric percentage score, never N/A.
 
 **Instructions**:
 1. Extract all important ATS-friendly keywords, skills, qualifications, and requirements from the job description
@@ -187,21 +188,19 @@ Provide 5-7 specific, actionable recommendations to improve ATS compatibility:
 5. Incorporate "2+ years of experience" context by highlighting the duration and depth of your internships
 6. Use exact phrase "Power BI dashboard" instead of just "dashboard" to match ATS keyword scanning
 7. Add a summary section at the top with key terms: "Data Analyst," "Python," "SQL," and "Healthcare" for better ATS visibility
-"""
 
-LINKEDIN_MESSAGE_PROMPT = """You are a professional networking expert who crafts personalized LinkedIn messages.
-
-**Task**: Write a brief, personalized LinkedIn message to a recruiter or hiring manager about a specific job opportunity.
+**Request Details**:
 
 **Job Description**:
 {job_description}
 
-**Company Name**: {company_name}
+**Candidate's Resume Content**:
+{resume_content}
+"""
 
-**Role Title**: {role_title}
+LINKEDIN_MESSAGE_PROMPT = """You are a professional networking expert who crafts personalized LinkedIn messages.
 
-**One Key Achievement/Qualification**:
-{achievement}
+**Task**: Write a brief, personalized LinkedIn message to a recruiter or hiring manager about a specific job opportunity.
 
 **Instructions**:
 1. Keep the message to 2-3 sentences, under 150 words total
@@ -221,9 +220,63 @@ Hi [RECRUITER_NAME],
 I noticed the [Role Title] opening at [Company] and was immediately drawn to [specific aspect]. With my experience in [relevant area] where I [brief achievement], I believe I could contribute significantly to your team. Would you be open to a brief call to discuss how my background aligns with your needs?
 
 Best regards
+
+**Request Details**:
+
+**Job Description**:
+{job_description}
+
+**Company Name**: {company_name}
+
+**Role Title**: {role_title}
+
+**One Key Achievement/Qualification**:
+{achievement}
 """
 
 
+# Each template puts its static instructions first and the per-request inputs after
+# this marker, so the prefix is byte-identical across calls and can be served from
+# the provider's prompt cache. Nothing before the marker may contain a {field}.
+_PREFIX_END_MARKER = "**Request Details**:"
+
+
+PROMPTS = {
+    "resume_bullets": RESUME_BULLET_PROMPT,
+    "cover_letter": COVER_LETTER_PROMPT,
+    "ats_analysis": ATS_ANALYSIS_PROMPT,
+    "linkedin_message": LINKEDIN_MESSAGE_PROMPT
+}
+
+
+def _compile_template(template: str) -> List[Tuple[str, Optional[str]]]:
+    """
+    Split a template into (literal text, field name) pieces once, so formatting
+    doesn't have to re-scan the template for placeholders on every call.
+
+    Args:
+        template (str): A str.format-style template with plain {field} placeholders.
+
+    Returns:
+        List[Tuple[str, Optional[str]]]: Literal text followed by the field to insert after it (None at the end).
+    """
+    return [(literal, field) for literal, field, _, _ in Formatter().parse(template)]
+
+
+# Templates are fixed at import time, so parse them once
+_COMPILED_PROMPTS = {name: _compile_template(template) for name, template in PROMPTS.items()}
+
+for _name, _pieces in _COMPILED_PROMPTS.items():
+    if _PREFIX_END_MARKER not in _pieces[0][0]:
+        raise ValueError(f"Prompt '{_name}' has a placeholder before {_PREFIX_END_MARKER!r}; keep the static prefix first.")
+
+# Fields each template requires, so missing arguments are found with one set difference
+_FIELDS = {
+    name: frozenset(field for _, field in pieces if field is not None)
+    for name, pieces in _COMPILED_PROMPTS.items()
+}
+
+
 def get_prompt(prompt_type: str, **kwargs) -> str:
     """
     Get a formatted prompt template with variables substituted.
@@ -248,19 +301,14 @@ def get_prompt(prompt_type: str, **kwargs) -> str:
         ...                     context="...", 
         ...                     name="John Doe")
     """
-    prompts = {
-        "resume_bullets": RESUME_BULLET_PROMPT,
-        "cover_letter": COVER_LETTER_PROMPT,
-        "ats_analysis": ATS_ANALYSIS_PROMPT,
-        "linkedin_message": LINKEDIN_MESSAGE_PROMPT
-    }
-
-    if prompt_type not in prompts:
-        raise ValueError(f"Unknown prompt type: {prompt_type}. Valid types: {list(prompts.keys())}")
-
-    template = prompts[prompt_type]
-
-    try:
-        return template.format(**kwargs)
-    except KeyError as e:
-        raise ValueError(f"Missing required argument for {prompt_type} prompt: {e}")
+    if prompt_type not in _COMPILED_PROMPTS:
+        raise ValueError(f"Unknown prompt type: {prompt_type}. Valid types: {list(PROMPTS.keys())}")
+
+    missing = _FIELDS[prompt_type] - kwargs.keys()
+    if missing:
+        raise ValueError(f"Missing required arguments for {prompt_type} prompt: {sorted(missing)}")
+
+    return "".join(
+        literal + (str(kwargs[field]) if field is not None else "")
+        for literal, field in _COMPILED_PROMPTS[prompt_type]
+    )
@@ -1,21 +1,151 @@
 import os
+import asyncio
+import hashlib
 import logging
-from typing import List, Dict, Any, Optional
+import threading
+from itertools import islice
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Tuple, Union
+import httpx
+import numpy as np
+import openai
 import chromadb
 from chromadb.utils import embedding_functions
 from langchain_openai import OpenAIEmbeddings
+from tenacity import (
+    AsyncRetrying, Retrying, retry_if_exception_type, stop_after_attempt, wait_random_exponential
+)
 from dotenv import load_dotenv
+from .embedding_cache import EmbeddingCache
+from .event_loop import run_sync
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Per-request limits of the embeddings API: inputs, and tokens kept under its 300K ceiling
+EMBED_BATCH_MAX_INPUTS = 2048
+EMBED_BATCH_MAX_TOKENS = 280_000
+
+# Connection pool shared by all sync embeddings requests, and the timeout of each request
+EMBED_HTTP_LIMITS = httpx.Limits(max_connections=32, max_keepalive_connections=16)
+EMBED_HTTP_TIMEOUT = 60.0
+
+# Transient API errors retried with jittered exponential backoff; anything else fails at once
+EMBED_RETRYABLE_ERRORS = (
+    openai.RateLimitError,
+    openai.APITimeoutError,
+    openai.APIConnectionError,
+    openai.InternalServerError
+)
+EMBED_MAX_ATTEMPTS = 6
+
+# Maximum chunks per collection upsert, which bounds Chroma's peak memory during ingest
+UPSERT_SHARD_SIZE = 1000
+# Chunks taken from the input at a time by add_documents, enough for a few full embeddings requests
+INGEST_SHARD_SIZE = 8192
+
+def _plan_batches(texts: List[str], batch_size: int, max_tokens: int = EMBED_BATCH_MAX_TOKENS) -> List[Tuple[int, int]]:
+    """
+    Greedily pack texts into consecutive batches of at most batch_size texts and an
+    estimated max_tokens tokens, at about 4 characters per token.
+
+    Args:
+        texts (List[str]): Texts to batch, ideally sorted by length.
+        batch_size (int): Maximum texts per batch, capped at EMBED_BATCH_MAX_INPUTS.
+        max_tokens (int): Maximum estimated tokens per batch. A longer single text gets its own batch.
+
+    Returns:
+        List[Tuple[int, int]]: (start, end) slice bounds of each batch.
+    """
+    batch_size = min(batch_size, EMBED_BATCH_MAX_INPUTS)
+    bounds = []
+    start = 0
+    tokens = 0
+    for i, text in enumerate(texts):
+        text_tokens = max(1, len(text) // 4)
+        if i > start and (i - start >= batch_size or tokens + text_tokens > max_tokens):
+            bounds.append((start, i))
+            start, tokens = i, 0
+        tokens += text_tokens
+    if start < len(texts):
+        bounds.append((start, len(texts)))
+    return bounds
+
+def _retry_policy() -> Dict[str, Any]:
+    """
+    Retry settings shared by the sync and async embeddings calls.
+
+    Returns:
+        Dict[str, Any]: Keyword arguments for tenacity's Retrying and AsyncRetrying.
+    """
+    def log_retry(retry_state) -> None:
+        logger.warning(
+            f"Embeddings request failed ({retry_state.outcome.exception()}), "
+            f"retrying (attempt {retry_state.attempt_number}/{EMBED_MAX_ATTEMPTS})."
+        )
+
+    return {
+        'retry': retry_if_exception_type(EMBED_RETRYABLE_ERRORS),
+        'wait': wait_random_exponential(multiplier=1, min=1, max=30),
+        'stop': stop_after_attempt(EMBED_MAX_ATTEMPTS),
+        'before_sleep': log_retry,
+        'reraise': True
+    }
+
+def _normalize_embeddings(embeddings: Union[List[List[float]], np.ndarray]) -> np.ndarray:
+    """
+    Scale embeddings to unit length as float32, so cosine similarity is a plain dot
+    product and L2 distance in the collection ranks the same as cosine.
+
+    Args:
+        embeddings (List[List[float]] or np.ndarray): Embedding vectors.
+
+    Returns:
+        np.ndarray: The normalized vectors as a contiguous (N, d) float32 array.
+    """
+    vectors = np.asarray(embeddings, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1
+    return np.ascontiguousarray(vectors / norms)
+
+def _top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """
+    Indices of the k highest scores, best first, without sorting the whole array.
+
+    Args:
+        scores (np.ndarray): 1-D array of scores.
+        k (int): Number of indices to return, at most len(scores).
+
+    Returns:
+        np.ndarray: Indices of the top k scores in descending order.
+    """
+    if k < len(scores):
+        # O(N) selection of the top k, then sort only those
+        top = np.argpartition(-scores, k - 1)[:k]
+    else:
+        top = np.arange(len(scores))
+    return top[np.argsort(-scores[top])]
+
 class RAGPipeline:
     """
     A class to handle the RAG pipeline: embeddings, vector storage, and semantic search.
     """
 
-    def __init__(self, openai_api_key: str, chroma_client: Optional[chromadb.ClientAPI] = None, collection_name: str = "job_assistant"):
+    def __init__(
+        self,
+        openai_api_key: str,
+        chroma_client: Optional[chromadb.ClientAPI] = None,
+        collection_name: str = "job_assistant",
+        embed_batch_size: int = EMBED_BATCH_MAX_INPUTS,
+        max_parallel_embeds: int = 8,
+        embedding_cache: Optional[EmbeddingCache] = None,
+        use_embedding_cache: bool = True,
+        in_memory_search: bool = False,
+        hnsw_space: str = "cosine",
+        hnsw_m: int = 24,
+        hnsw_construction_ef: int = 128,
+        hnsw_search_ef: int = 100
+    ):
         """
         Initialize the RAGPipeline.
 
@@ -23,12 +153,48 @@ class RAGPipeline:
             openai_api_key (str): OpenAI API Key.
             chroma_client (chromadb.ClientAPI, optional): ChromaDB client. Defaults to None (creates a new PersistentClient).
             collection_name (str): Name of the ChromaDB collection.
+            embed_batch_size (int): Maximum texts per embeddings request. Batches are also
+                capped by estimated tokens, so the default packs each request up to the API limits.
+            max_parallel_embeds (int): Maximum embeddings requests in flight at once.
+            embedding_cache (EmbeddingCache, optional): On-disk cache of document embeddings.
+                Defaults to a new EmbeddingCache in the data directory.
+            use_embedding_cache (bool): Whether to reuse embeddings of previously seen text.
+            in_memory_search (bool): Search an in-memory copy of the collection's embeddings
+                instead of querying Chroma. Suits collections that fit in RAM.
+            hnsw_space (str): Distance function of the HNSW index ("cosine", "l2" or "ip").
+            hnsw_m (int): Graph links per node. Higher raises recall at the cost of memory and insert time.
+            hnsw_construction_ef (int): Candidate list size while building the index. Higher gives
+                a better graph but slower inserts.
+            hnsw_search_ef (int): Candidate list size per query. Higher raises recall but adds
+                query latency; Chroma's default of 10 loses recall once the collection grows.
+
+        The HNSW settings only apply when the collection is created; an existing collection
+        keeps the settings it was created with until it is reset.
         """
         self.openai_api_key = openai_api_key
         if not self.openai_api_key:
             logger.warning("OpenAI API Key is missing. Embeddings will fail.")
         
         self.collection_name = collection_name
+        self.embed_batch_size = embed_batch_size
+        self.max_parallel_embeds = max_parallel_embeds
+        self.hnsw_metadata = {
+            "hnsw:space": hnsw_space,
+            "hnsw:M": hnsw_m,
+            "hnsw:construction_ef": hnsw_construction_ef,
+            "hnsw:search_ef": hnsw_search_ef
+        }
+        # Incremented whenever the collection contents change, so callers can invalidate cached searches
+        self.store_version = 0
+
+        # In-memory copy of the collection for in_memory_search, loaded on first search
+        self.in_memory_search = in_memory_search
+        self._emb_matrix: Optional[np.ndarray] = None
+        self._matrix_ids: List[str] = []
+        self._matrix_rows: Dict[str, int] = {}
+        self._matrix_documents: List[str] = []
+        self._matrix_metadatas: List[Dict[str, Any]] = []
+        self._matrix_lock = threading.Lock()
         
         if chroma_client:
             self.client = chroma_client
@@ -43,10 +209,30 @@ class RAGPipeline:
             logger.info(f"Using ChromaDB path: {data_path}")
             self.client = chromadb.PersistentClient(path=data_path)
             
+        # Pooled clients keep connections warm across requests, skipping the TLS handshake.
+        # Query embeddings use the sync one; ingest batches use the async one, which is only
+        # ever awaited on the shared run_sync loop, so its pool stays bound to a live loop
+        self.http_client = httpx.Client(limits=EMBED_HTTP_LIMITS)
+        self.http_async_client = httpx.AsyncClient(limits=EMBED_HTTP_LIMITS)
         self.embedding_model = OpenAIEmbeddings(
             model="text-embedding-3-small",
-            openai_api_key=self.openai_api_key
+            openai_api_key=self.openai_api_key,
+            # Batches are planned here; keep the client from splitting them further
+            chunk_size=EMBED_BATCH_MAX_INPUTS,
+            # Retries are handled by the tenacity policy alone, with jittered backoff
+            max_retries=0,
+            # Per-request timeouts override the httpx client's, so it is set here
+            request_timeout=EMBED_HTTP_TIMEOUT,
+            http_client=self.http_client,
+            http_async_client=self.http_async_client
         )
+
+        self.embedding_cache = None
+        if use_embedding_cache:
+            try:
+                self.embedding_cache = embedding_cache or EmbeddingCache(model=self.embedding_model.model)
+            except Exception as e:
+                logger.warning(f"Could not open embedding cache ({e}), embedding without it.")
         
         self.collection = None
         self.setup_vectorstore()
@@ -62,96 +248,556 @@ class RAGPipeline:
             # However, Chroma's get_or_create_collection can take an embedding function.
             # Let's stick to manual embedding generation to satisfy the specific method requirement clearly.
             
-            self.collection = self.client.get_or_create_collection(name=self.collection_name)
+            self.collection = self.client.get_or_create_collection(
+                name=self.collection_name,
+                metadata=self.hnsw_metadata
+            )
             logger.info(f"Vector store collection '{self.collection_name}' ready.")
         except Exception as e:
             logger.error(f"Failed to setup vector store: {e}")
 
-    def create_embeddings(self, texts: List[str]) -> List[List[float]]:
+    def create_embeddings(self, texts: List[str], batch_size: Optional[int] = None) -> np.ndarray:
         """
         Generate embeddings for a list of texts using OpenAI.
 
         Args:
             texts (List[str]): List of text strings.
+            batch_size (int, optional): Maximum texts per embeddings request. Defaults to the pipeline's embed_batch_size.
 
         Returns:
-            List[List[float]]: List of embedding vectors.
+            np.ndarray: Contiguous (N, d) float32 array with one row per text, empty if the API call fails.
+
+        Raises:
+            RuntimeError: If the coroutine cannot be run, e.g. when called from the background loop.
         """
+        if not texts:
+            return np.empty((0, 0), dtype=np.float32)
         try:
-            if not texts:
-                return []
-            return self.embedding_model.embed_documents(texts)
+            # Runs on the shared background loop, so this also works under a running event loop
+            return run_sync(self.acreate_embeddings(texts, batch_size=batch_size))
+        except RuntimeError:
+            raise
         except Exception as e:
             logger.error(f"Failed to create embeddings: {e}")
-            return []
+            return np.empty((0, 0), dtype=np.float32)
+
+    async def acreate_embeddings(self, texts: List[str], batch_size: Optional[int] = None) -> np.ndarray:
+        """
+        Generate embeddings with the batches sent as concurrent requests.
+
+        Texts are sorted by length first so each request holds inputs of similar
+        size, then the embeddings are put back in the original order.
+
+        Args:
+            texts (List[str]): List of text strings.
+            batch_size (int, optional): Maximum texts per embeddings request. Defaults to the pipeline's embed_batch_size.
+
+        Returns:
+            np.ndarray: Contiguous (N, d) float32 array, rows in the order of texts.
+        """
+        if not texts:
+            return np.empty((0, 0), dtype=np.float32)
+        batch_size = batch_size or self.embed_batch_size
+        # Bound the requests in flight so large uploads don't trip the rate limit
+        semaphore = asyncio.Semaphore(self.max_parallel_embeds)
+
+        order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+        sorted_texts = [texts[i] for i in order]
+
+        async def embed_batch(start: int, end: int) -> np.ndarray:
+            async with semaphore:
+                return await self._aembed_documents(sorted_texts[start:end])
 
-    def add_documents(self, chunks: List[Dict[str, Any]]) -> None:
+        # gather returns batches in submission order, so they line up with sorted_texts
+        batches = await asyncio.gather(*(embed_batch(start, end) for start, end in _plan_batches(sorted_texts, batch_size)))
+
+        sorted_embeddings = np.concatenate(batches)
+        embeddings = np.empty_like(sorted_embeddings)
+        embeddings[order] = sorted_embeddings
+        return embeddings
+
+    async def _aembed_documents(self, texts: List[str]) -> np.ndarray:
+        """
+        Embed a batch of texts, serving any seen before from the embedding cache.
+        New embeddings are L2-normalized once here.
+
+        Args:
+            texts (List[str]): Texts to embed.
+
+        Returns:
+            np.ndarray: Contiguous (N, d) float32 array with the embedding of each text.
+        """
+        if self.embedding_cache is None:
+            return await self._aembed_with_retry(texts)
+
+        try:
+            cached = self.embedding_cache.get_many(texts)
+        except Exception as e:
+            logger.warning(f"Embedding cache read failed: {e}")
+            cached = [None] * len(texts)
+
+        missing = [i for i, embedding in enumerate(cached) if embedding is None]
+        if not missing:
+            return np.asarray(cached, dtype=np.float32)
+
+        missing_texts = [texts[i] for i in missing]
+        new_embeddings = await self._aembed_with_retry(missing_texts)
+        try:
+            self.embedding_cache.put_many(missing_texts, new_embeddings)
+        except Exception as e:
+            logger.warning(f"Embedding cache write failed: {e}")
+        if len(missing) == len(texts):
+            return new_embeddings
+
+        embeddings = np.empty((len(texts), new_embeddings.shape[1]), dtype=np.float32)
+        embeddings[missing] = new_embeddings
+        hits = [i for i, embedding in enumerate(cached) if embedding is not None]
+        embeddings[hits] = np.asarray([cached[i] for i in hits], dtype=np.float32)
+        return embeddings
+
+    async def _aembed_with_retry(self, texts: List[str]) -> np.ndarray:
+        """
+        Embed one batch through the API, retrying transient errors so only this batch waits.
+
+        Args:
+            texts (List[str]): Texts to embed.
+
+        Returns:
+            np.ndarray: Normalized (N, d) float32 embeddings.
+        """
+        async for attempt in AsyncRetrying(**_retry_policy()):
+            with attempt:
+                embeddings = await self.embedding_model.aembed_documents(texts)
+        return _normalize_embeddings(embeddings)
+
+    def add_documents(self, chunks: Iterable[Dict[str, Any]], embed_batch_size: Optional[int] = None) -> bool:
         """
         Add document chunks to the vector store.
 
+        Chunks are consumed INGEST_SHARD_SIZE at a time, so a generator such as
+        iter_document_chunks is never held in memory in full. Within a shard, chunks with
+        identical text are embedded once, and each batch is written to the collection
+        while the next one is being embedded.
+
         Args:
-            chunks (List[Dict[str, Any]]): List of document chunks with 'text' and 'metadata'.
+            chunks (Iterable[Dict[str, Any]]): Document chunks with 'text' and 'metadata', as a list or generator.
+            embed_batch_size (int, optional): Maximum texts per embeddings request. Defaults to the pipeline's embed_batch_size.
+
+        Returns:
+            bool: True if every chunk was written, False if indexing failed part way.
         """
-        if not chunks:
+        chunk_iter = iter(chunks)
+        first_shard = list(islice(chunk_iter, INGEST_SHARD_SIZE))
+        if not first_shard:
             logger.warning("No chunks to add.")
-            return
+            return True
 
         try:
-            texts = [chunk['text'] for chunk in chunks]
-            metadatas = [chunk['metadata'] for chunk in chunks]
-            ids = [f"{chunk['metadata']['filename']}_{chunk['metadata']['chunk_index']}" for chunk in chunks]
-            
-            # Generate embeddings
-            embeddings = self.create_embeddings(texts)
-            
-            if not embeddings:
-                logger.error("Failed to generate embeddings. Aborting add_documents.")
-                return
-
-            self.collection.upsert(
-                documents=texts,
-                embeddings=embeddings,
-                metadatas=metadatas,
-                ids=ids
+            # The shared loop keeps the embeddings client's connection pool valid across calls
+            written, embedded = run_sync(self._add_shards(
+                first_shard, chunk_iter, embed_batch_size or self.embed_batch_size
+            ))
+            logger.info(
+                f"Added/Updated {written} chunks in collection '{self.collection_name}' "
+                f"({embedded} unique texts embedded)."
             )
-            logger.info(f"Added/Updated {len(chunks)} chunks in collection '{self.collection_name}'.")
+            return True
         except Exception as e:
             logger.error(f"Failed to add documents to vector store: {e}")
+            return False
+        finally:
+            # Shards may have been written even if a later one failed
+            self.store_version += 1
+
+    async def _add_shards(
+        self,
+        first_shard: List[Dict[str, Any]],
+        chunk_iter: Iterator[Dict[str, Any]],
+        batch_size: int
+    ) -> Tuple[int, int]:
+        """
+        Embed and upsert chunks one shard at a time, pulling each shard from the iterator
+        only after the previous one is written.
+
+        Args:
+            first_shard (List[Dict[str, Any]]): The first shard, already taken from the iterator.
+            chunk_iter (Iterator[Dict[str, Any]]): The remaining chunks.
+            batch_size (int): Maximum texts per embeddings request.
+
+        Returns:
+            Tuple[int, int]: Number of chunks written and of unique texts embedded.
+        """
+        written = 0
+        embedded = 0
+        shard = first_shard
+        while shard:
+            # One pass over the shard builds the aligned lists and groups chunks by a hash
+            # of their text, so boilerplate repeated across documents is only embedded once
+            n_chunks = len(shard)
+            texts: List[str] = [None] * n_chunks
+            metadatas: List[Dict[str, Any]] = [None] * n_chunks
+            ids: List[str] = [None] * n_chunks
+            groups: Dict[bytes, List[int]] = {}
+            for i, chunk in enumerate(shard):
+                text = chunk['text']
+                metadata = chunk['metadata']
+                texts[i] = text
+                metadatas[i] = metadata
+                ids[i] = f"{metadata['filename']}_{metadata['chunk_index']}"
+                groups.setdefault(hashlib.blake2b(text.encode('utf-8'), digest_size=16).digest(), []).append(i)
+
+            # Sort by length so each batch holds texts of similar size.
+            # Each group keeps the positions of its chunks, so stored order does not matter.
+            positions = sorted(groups.values(), key=lambda group: len(texts[group[0]]))
+            unique_texts = [texts[group[0]] for group in positions]
+
+            # Generate embeddings and write them to the collection
+            written += await self._embed_and_upsert(
+                unique_texts, positions, texts, metadatas, ids, batch_size, already_written=written
+            )
+            embedded += len(unique_texts)
+            shard = list(islice(chunk_iter, INGEST_SHARD_SIZE))
+        return written, embedded
 
-    def search_similar(self, query: str, n_results: int = 5) -> List[Dict[str, Any]]:
+    async def _embed_and_upsert(
+        self,
+        unique_texts: List[str],
+        positions: List[List[int]],
+        texts: List[str],
+        metadatas: List[Dict[str, Any]],
+        ids: List[str],
+        batch_size: int,
+        max_pending_batches: int = 8,
+        already_written: int = 0
+    ) -> int:
+        """
+        Embed unique texts batch by batch and upsert every chunk of each batch as soon as it is ready.
+
+        Up to max_parallel_embeds embeddings requests run at once, and a write worker
+        upserts each batch from a bounded queue as soon as it arrives, so vector
+        store writes overlap with the embeddings requests still in flight. If any
+        batch or write fails, every other task is cancelled before the error is raised.
+
+        Args:
+            unique_texts (List[str]): Distinct chunk texts to embed.
+            positions (List[List[int]]): For each unique text, the indices of the chunks that have it.
+            texts (List[str]): Chunk texts.
+            metadatas (List[Dict[str, Any]]): Chunk metadata, aligned with texts.
+            ids (List[str]): Chunk IDs, aligned with texts.
+            batch_size (int): Maximum texts per embeddings request.
+            max_pending_batches (int): Embedded batches allowed to wait for writing.
+            already_written (int): Chunks written by earlier shards, for progress logging.
+
+        Returns:
+            int: Number of chunks written.
+        """
+        queue: asyncio.Queue = asyncio.Queue(maxsize=max_pending_batches)
+        semaphore = asyncio.Semaphore(self.max_parallel_embeds)
+
+        async def embed_batch(start: int, end: int) -> None:
+            async with semaphore:
+                embeddings = await self._aembed_documents(unique_texts[start:end])
+            # Batches finish out of order; the queue carries their slice bounds
+            await queue.put((start, end, embeddings))
+
+        async def embed_worker() -> None:
+            # The task group cancels the remaining batches as soon as one fails
+            async with asyncio.TaskGroup() as batches:
+                for start, end in _plan_batches(unique_texts, batch_size):
+                    batches.create_task(embed_batch(start, end))
+            await queue.put(None)
+
+        async def write_worker() -> int:
+            written = 0
+            while (batch := await queue.get()) is not None:
+                start, end, embeddings = batch
+                # Fan each embedding row back out to every chunk with that text
+                groups = positions[start:end]
+                chunk_indices = [i for group in groups for i in group]
+                embedding_rows = np.repeat(np.arange(len(groups)), [len(group) for group in groups])
+                # Duplicated texts can make a batch's rows outgrow one shard
+                for shard_start in range(0, len(chunk_indices), UPSERT_SHARD_SIZE):
+                    shard = chunk_indices[shard_start:shard_start + UPSERT_SHARD_SIZE]
+                    shard_documents = [texts[i] for i in shard]
+                    shard_embeddings = embeddings[embedding_rows[shard_start:shard_start + UPSERT_SHARD_SIZE]]
+                    shard_metadatas = [metadatas[i] for i in shard]
+                    shard_ids = [ids[i] for i in shard]
+                    await asyncio.to_thread(
+                        self.collection.upsert,
+                        documents=shard_documents,
+                        # chromadb 0.4.x only accepts lists; convert once, at the boundary
+                        embeddings=shard_embeddings.tolist(),
+                        metadatas=shard_metadatas,
+                        ids=shard_ids
+                    )
+                    self._update_matrix(shard_ids, shard_documents, shard_metadatas, shard_embeddings)
+                    written += len(shard)
+                    logger.info(f"Upserted {already_written + written} chunks so far.")
+            return written
+
+        try:
+            # A failure on either side cancels the other, so nothing is left running
+            # on the shared loop or blocked on a queue nobody reads
+            async with asyncio.TaskGroup() as workers:
+                workers.create_task(embed_worker())
+                writer = workers.create_task(write_worker())
+        except ExceptionGroup as group:
+            # Raise the underlying error rather than the (nested) group wrapper
+            error: BaseException = group
+            while isinstance(error, ExceptionGroup):
+                error = error.exceptions[0]
+            raise error from group
+        return writer.result()
+
+    def search_similar(self, query: str, n_results: int = 5, include_embeddings: bool = False) -> List[Dict[str, Any]]:
         """
         Search for similar documents using the query.
 
         Args:
             query (str): The search query.
             n_results (int): Number of results to return.
+            include_embeddings (bool): Also return each chunk's stored embedding under 'embedding'.
 
         Returns:
             List[Dict[str, Any]]: List of results with metadata and distance.
         """
+        return self.search_similar_batch([query], n_results=n_results, include_embeddings=include_embeddings)[0]
+
+    def search_similar_batch(
+        self,
+        queries: List[str],
+        n_results: int = 5,
+        include_embeddings: bool = False
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Search for several queries with one embeddings request and one collection query.
+
+        Args:
+            queries (List[str]): The search queries.
+            n_results (int): Number of results to return per query.
+            include_embeddings (bool): Also return each chunk's stored embedding under 'embedding'.
+
+        Returns:
+            List[List[Dict[str, Any]]]: Results for each query, in order.
+        """
+        if not queries:
+            return []
         try:
-            query_embedding = self.embedding_model.embed_query(query)
-            
+            query_embeddings = self.embed_queries(queries)
+        except Exception as e:
+            logger.error(f"Search failed: {e}")
+            return [[] for _ in queries]
+        return self.search_by_embeddings(query_embeddings, n_results=n_results, include_embeddings=include_embeddings)
+
+    def embed_queries(self, queries: List[str]) -> List[List[float]]:
+        """
+        Embed search queries in one request, retrying transient API errors.
+
+        Args:
+            queries (List[str]): The search queries.
+
+        Returns:
+            List[List[float]]: One embedding per query, in order.
+
+        Raises:
+            Exception: The last API error, once retries are exhausted or for a permanent error.
+        """
+        for attempt in Retrying(**_retry_policy()):
+            with attempt:
+                embeddings = self.embedding_model.embed_documents(queries)
+        return embeddings
+
+    def search_by_embedding(
+        self,
+        query_embedding: List[float],
+        n_results: int = 5,
+        include_embeddings: bool = False,
+        raise_errors: bool = False
+    ) -> List[Dict[str, Any]]:
+        """
+        Search for similar documents using a precomputed query embedding.
+
+        Args:
+            query_embedding (List[float]): Embedding of the search query.
+            n_results (int): Number of results to return.
+            include_embeddings (bool): Also return each chunk's stored embedding under 'embedding'.
+            raise_errors (bool): Raise search errors instead of returning no results.
+
+        Returns:
+            List[Dict[str, Any]]: List of results with metadata and distance.
+        """
+        return self.search_by_embeddings(
+            [query_embedding], n_results=n_results, include_embeddings=include_embeddings, raise_errors=raise_errors
+        )[0]
+
+    def search_by_embeddings(
+        self,
+        query_embeddings: List[List[float]],
+        n_results: int = 5,
+        include_embeddings: bool = False,
+        raise_errors: bool = False
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Search for similar documents for several precomputed query embeddings in one collection query.
+
+        Args:
+            query_embeddings (List[List[float]]): Embeddings of the search queries.
+            n_results (int): Number of results to return per query.
+            include_embeddings (bool): Also return each chunk's stored embedding under 'embedding'.
+            raise_errors (bool): Raise search errors instead of returning no results, so callers
+                can tell a failed search from an empty collection.
+
+        Returns:
+            List[List[Dict[str, Any]]]: Results for each query, in order, with metadata and distance.
+        """
+        if not query_embeddings:
+            return []
+        if self.in_memory_search:
+            try:
+                return self._search_matrix(query_embeddings, n_results, include_embeddings)
+            except Exception as e:
+                logger.warning(f"In-memory search failed ({e}), querying the collection.")
+        try:
+            include = ["documents", "metadatas", "distances"]
+            if include_embeddings:
+                include.append("embeddings")
             results = self.collection.query(
-                query_embeddings=[query_embedding],
-                n_results=n_results
+                query_embeddings=query_embeddings,
+                n_results=n_results,
+                include=include
             )
             
-            # Format results
-            formatted_results = []
-            if results['ids']:
-                for i in range(len(results['ids'][0])):
-                    formatted_results.append({
-                        'id': results['ids'][0][i],
-                        'text': results['documents'][0][i],
-                        'metadata': results['metadatas'][0][i],
-                        'distance': results['distances'][0][i] if results['distances'] else None
-                    })
+            # Format results, one list per query
+            all_results = []
+            for q in range(len(query_embeddings)):
+                formatted_results = []
+                if results['ids']:
+                    for i in range(len(results['ids'][q])):
+                        formatted_results.append({
+                            'id': results['ids'][q][i],
+                            'text': results['documents'][q][i],
+                            'metadata': results['metadatas'][q][i],
+                            'distance': results['distances'][q][i] if results['distances'] else None
+                        })
+                        if include_embeddings:
+                            formatted_results[-1]['embedding'] = results['embeddings'][q][i]
+                all_results.append(formatted_results)
             
-            return formatted_results
+            return all_results
         except Exception as e:
             logger.error(f"Search failed: {e}")
-            return []
+            if raise_errors:
+                raise
+            return [[] for _ in query_embeddings]
+
+    def _ensure_matrix_warm(self) -> None:
+        """
+        Load every embedding in the collection into a normalized float32 matrix, once.
+        Caller must hold the matrix lock.
+        """
+        if self._emb_matrix is not None:
+            return
+        data = self.collection.get(include=["embeddings", "documents", "metadatas"])
+        self._matrix_ids = list(data['ids'])
+        self._matrix_rows = {chunk_id: row for row, chunk_id in enumerate(self._matrix_ids)}
+        self._matrix_documents = list(data['documents'])
+        self._matrix_metadatas = list(data['metadatas'])
+        if self._matrix_ids:
+            # Contiguous float32 so scoring is a single BLAS matrix product
+            self._emb_matrix = _normalize_embeddings(data['embeddings'])
+        else:
+            self._emb_matrix = np.empty((0, 0), dtype=np.float32)
+        logger.info(f"Loaded {len(self._matrix_ids)} embeddings into memory for search.")
+
+    def _update_matrix(
+        self,
+        ids: List[str],
+        documents: List[str],
+        metadatas: List[Dict[str, Any]],
+        embeddings: np.ndarray
+    ) -> None:
+        """
+        Mirror an upsert into the in-memory matrix: known IDs are overwritten in place
+        and new ones appended, so the matrix is never rebuilt from the collection.
+
+        Args:
+            ids (List[str]): Chunk IDs.
+            documents (List[str]): Chunk texts.
+            metadatas (List[Dict[str, Any]]): Chunk metadata.
+            embeddings (np.ndarray): Normalized (N, d) float32 chunk embeddings.
+        """
+        with self._matrix_lock:
+            if self._emb_matrix is None:
+                # Not loaded yet; the first search will read these rows from the collection
+                return
+            vectors = np.asarray(embeddings, dtype=np.float32)
+            new_rows = []
+            for chunk_id, document, metadata, vector in zip(ids, documents, metadatas, vectors):
+                row = self._matrix_rows.get(chunk_id)
+                if row is None:
+                    self._matrix_rows[chunk_id] = len(self._matrix_ids)
+                    self._matrix_ids.append(chunk_id)
+                    self._matrix_documents.append(document)
+                    self._matrix_metadatas.append(metadata)
+                    new_rows.append(vector)
+                else:
+                    self._emb_matrix[row] = vector
+                    self._matrix_documents[row] = document
+                    self._matrix_metadatas[row] = metadata
+            if new_rows:
+                if self._emb_matrix.size:
+                    self._emb_matrix = np.concatenate([self._emb_matrix, np.stack(new_rows)])
+                else:
+                    self._emb_matrix = np.stack(new_rows)
+
+    def _search_matrix(
+        self,
+        query_embeddings: List[List[float]],
+        n_results: int,
+        include_embeddings: bool
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Search the in-memory matrix by cosine similarity.
+
+        Distances follow the collection's HNSW space (cosine distance, or squared L2
+        between the normalized vectors), which matches what Chroma would return for
+        unit-length queries such as OpenAI's.
+
+        Args:
+            query_embeddings (List[List[float]]): Embeddings of the search queries.
+            n_results (int): Number of results to return per query.
+            include_embeddings (bool): Also return each chunk's stored embedding under 'embedding'.
+
+        Returns:
+            List[List[Dict[str, Any]]]: Results for each query, in order.
+        """
+        with self._matrix_lock:
+            self._ensure_matrix_warm()
+            if not self._matrix_ids:
+                return [[] for _ in query_embeddings]
+
+            queries = _normalize_embeddings(query_embeddings)
+            # One BLAS call scores every chunk for every query
+            scores = queries @ self._emb_matrix.T
+            k = min(n_results, len(self._matrix_ids))
+            # Squared L2 between unit vectors is 2 - 2cos; cosine and ip distances are 1 - cos
+            space = (self.collection.metadata or {}).get("hnsw:space", "l2") if self.collection else "l2"
+            scale = 2.0 if space == "l2" else 1.0
+
+            all_results = []
+            for query_scores in scores:
+                formatted_results = []
+                for row in _top_k(query_scores, k):
+                    formatted_results.append({
+                        'id': self._matrix_ids[row],
+                        'text': self._matrix_documents[row],
+                        'metadata': self._matrix_metadatas[row],
+                        'distance': float(scale * (1 - query_scores[row]))
+                    })
+                    if include_embeddings:
+                        formatted_results[-1]['embedding'] = self._emb_matrix[row].copy()
+                all_results.append(formatted_results)
+            return all_results
 
     def reset_vectorstore(self) -> None:
         """
@@ -168,6 +814,9 @@ class RAGPipeline:
                 logger.warning(f"Error deleting collection: {e}. Attempting to recreate anyway.")
             
             self.setup_vectorstore()
+            with self._matrix_lock:
+                self._emb_matrix = None
+            self.store_version += 1
             logger.info(f"Collection '{self.collection_name}' reset successfully.")
         except Exception as e:
             logger.error(f"Failed to reset vector store: {e}")
@@ -0,0 +1,170 @@
+"""
+Module for the semantic answer cache.
+Reuses generated outputs for similar job descriptions when they are grounded on the same context.
+"""
+
+import time
+import logging
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Any, Optional, Sequence, Tuple
+import numpy as np
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+class SemanticCache:
+    """
+    An in-memory LRU cache of generated outputs, looked up by job description similarity.
+
+    A cached output is only served when the new job description embedding is close to the
+    cached one AND the retrieved context overlaps enough with the context the cached output
+    was generated from, so answers are never reused across different evidence.
+    """
+
+    def __init__(
+        self,
+        similarity_threshold: float = 0.92,
+        overlap_threshold: float = 0.7,
+        max_entries: int = 256,
+        ttl_seconds: float = 3600
+    ):
+        """
+        Initialize the SemanticCache.
+
+        Args:
+            similarity_threshold (float): Minimum cosine similarity between job description embeddings.
+            overlap_threshold (float): Minimum Jaccard overlap between retrieved chunk IDs.
+            max_entries (int): Maximum number of cached outputs; least recently used are evicted first.
+            ttl_seconds (float): How long an entry stays valid, in seconds.
+        """
+        self.similarity_threshold = similarity_threshold
+        self.overlap_threshold = overlap_threshold
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[int, Dict[str, Any]]" = OrderedDict()
+        self._next_id = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _normalize(embedding: Sequence[float]) -> np.ndarray:
+        """
+        Convert an embedding to a unit-length float32 vector.
+
+        Args:
+            embedding (Sequence[float]): The embedding vector.
+
+        Returns:
+            np.ndarray: The normalized vector.
+        """
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    @staticmethod
+    def _jaccard(a: frozenset, b: frozenset) -> float:
+        """
+        Compute the Jaccard overlap of two ID sets. Two empty sets count as identical.
+
+        Args:
+            a (frozenset): First set of chunk IDs.
+            b (frozenset): Second set of chunk IDs.
+
+        Returns:
+            float: Overlap between 0 and 1.
+        """
+        if not a and not b:
+            return 1.0
+        return len(a & b) / len(a | b)
+
+    def _evict_expired(self, now: float) -> None:
+        """
+        Drop entries older than the TTL. Caller must hold the lock.
+
+        Args:
+            now (float): Current time from time.monotonic().
+        """
+        expired = [entry_id for entry_id, entry in self._entries.items() if now - entry['created'] > self.ttl_seconds]
+        for entry_id in expired:
+            del self._entries[entry_id]
+
+    def get(
+        self,
+        prompt_type: str,
+        key: Tuple[str, ...],
+        embedding: Sequence[float],
+        chunk_ids: List[str]
+    ) -> Optional[str]:
+        """
+        Look up a cached output.
+
+        Args:
+            prompt_type (str): The prompt type, e.g. "cover_letter".
+            key (tuple): Exact-match inputs, e.g. (company_name, role_title).
+            embedding (Sequence[float]): Embedding of the job description.
+            chunk_ids (List[str]): IDs of the chunks retrieved for this request.
+
+        Returns:
+            str or None: The cached output, or None on a miss.
+        """
+        query = self._normalize(embedding)
+        ids = frozenset(chunk_ids)
+
+        with self._lock:
+            self._evict_expired(time.monotonic())
+
+            best_id, best_score = None, self.similarity_threshold
+            for entry_id, entry in self._entries.items():
+                if entry['prompt_type'] != prompt_type or entry['key'] != key:
+                    continue
+                score = float(entry['embedding'] @ query)
+                if score >= best_score and self._jaccard(entry['chunk_ids'], ids) >= self.overlap_threshold:
+                    best_id, best_score = entry_id, score
+
+            if best_id is None:
+                return None
+
+            self._entries.move_to_end(best_id)
+            logger.info(f"Semantic cache hit for {prompt_type} (similarity {best_score:.3f}).")
+            return self._entries[best_id]['result']
+
+    def put(
+        self,
+        prompt_type: str,
+        key: Tuple[str, ...],
+        embedding: Sequence[float],
+        chunk_ids: List[str],
+        result: str
+    ) -> None:
+        """
+        Store a generated output.
+
+        Args:
+            prompt_type (str): The prompt type, e.g. "cover_letter".
+            key (tuple): Exact-match inputs, e.g. (company_name, role_title).
+            embedding (Sequence[float]): Embedding of the job description.
+            chunk_ids (List[str]): IDs of the chunks the output was generated from.
+            result (str): The generated output.
+        """
+        entry = {
+            'prompt_type': prompt_type,
+            'key': key,
+            'embedding': self._normalize(embedding),
+            'chunk_ids': frozenset(chunk_ids),
+            'result': result,
+            'created': time.monotonic()
+        }
+
+        with self._lock:
+            self._entries[self._next_id] = entry
+            self._next_id += 1
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """
+        Remove all cached outputs.
+        """
+        with self._lock:
+            self._entries.clear()
@@ -1,12 +1,83 @@
+import os
 import re
+import sys
+import string
 import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
-from typing import List, Dict, Any
+from itertools import accumulate, chain
+from typing import List, Dict, Any, Iterator
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# clean_text keeps alphanumerics, whitespace and basic punctuation (.,!?-).
+# Everything else in ASCII is deleted with bytes.translate, which runs at memcpy speed.
+_KEPT_CHARS = set(string.ascii_letters + string.digits + ".,!?-")
+_ASCII_DELETE = bytes(c for c in range(128) if chr(c) not in _KEPT_CHARS and not chr(c).isspace())
+# Non-ASCII whitespace still separates words, so it becomes a space before non-ASCII is dropped
+_NON_ASCII_WHITESPACE = re.compile(
+    "[" + "".join(chr(c) for c in range(128, sys.maxunicode + 1) if chr(c).isspace()) + "]"
+)
+
+# Byte lookup tables for the compiled single-pass cleaner
+_ALLOWED_BYTES = np.array([c < 128 and chr(c) in _KEPT_CHARS for c in range(256)], dtype=np.bool_)
+_SPACE_BYTES = np.array([c < 128 and chr(c).isspace() for c in range(256)], dtype=np.bool_)
+# Shorter texts go through bytes.translate; the compiled call costs more than it saves on them
+COMPILED_CLEAN_MIN_CHARS = 4096
+
+if njit is not None:
+    @njit(cache=True)
+    def _clean_bytes(data, allowed, spaces):
+        """
+        Keep allowed bytes and collapse whitespace runs into one space in a single pass,
+        dropping leading and trailing whitespace.
+
+        Args:
+            data (np.ndarray): ASCII text as uint8.
+            allowed (np.ndarray): Boolean table of bytes to keep.
+            spaces (np.ndarray): Boolean table of whitespace bytes.
+
+        Returns:
+            np.ndarray: The cleaned text as uint8.
+        """
+        out = np.empty(data.shape[0], dtype=np.uint8)
+        n = 0
+        pending_space = False
+        for i in range(data.shape[0]):
+            byte = data[i]
+            if spaces[byte]:
+                pending_space = n > 0
+            elif allowed[byte]:
+                if pending_space:
+                    out[n] = 32
+                    n += 1
+                    pending_space = False
+                out[n] = byte
+                n += 1
+        return out[:n]
+else:
+    _clean_bytes = None
+
+# Worker processes are spawned, not forked, so they never inherit locks held by the
+# app's other threads (Streamlit, the background event loop, upload pools)
+_POOL_CONTEXT = multiprocessing.get_context("spawn")
+
+# Below this many documents, chunking runs in-process; starting worker processes costs more
+PARALLEL_CHUNKING_MIN_DOCS = 8
+
+# Patterns are compiled once at import rather than looked up on every call
+# Split on . ! ? followed by whitespace
+_SENTENCE_BOUNDARY = re.compile(r'(?<=[.!?])\s+')
+
 def clean_text(text: str) -> str:
     """
     Clean the input text by removing extra whitespace, special characters, and fixing line breaks.
@@ -21,73 +92,83 @@ def clean_text(text: str) -> str:
     if not text:
         return ""
     
-    # Replace multiple newlines with a single space
-    text = re.sub(r'\n+', ' ', text)
-    
-    # Remove special characters but keep basic punctuation (.,!?-')
-    # This regex allows alphanumeric, spaces, and specified punctuation
-    text = re.sub(r'[^a-zA-Z0-9\s.,!?-]', '', text)
+    # Remove special characters but keep basic punctuation (.,!?-)
+    # Only ASCII can survive, so drop the rest on encoding and filter the ASCII bytes
+    if not text.isascii():
+        text = _NON_ASCII_WHITESPACE.sub(' ', text)
+    if _clean_bytes is not None and len(text) >= COMPILED_CLEAN_MIN_CHARS:
+        # One compiled pass filters and collapses whitespace together
+        data = np.frombuffer(text.encode('ascii', 'ignore'), dtype=np.uint8)
+        return _clean_bytes(data, _ALLOWED_BYTES, _SPACE_BYTES).tobytes().decode('ascii')
+    text = text.encode('ascii', 'ignore').translate(None, _ASCII_DELETE).decode('ascii')
     
-    # Replace multiple spaces with a single space
-    text = re.sub(r'\s+', ' ', text)
-    
-    return text.strip()
+    # Collapse newlines and runs of spaces into a single space, and trim the ends
+    return " ".join(text.split())
 
-def chunk_text(text: str, chunk_size: int = 500, overlap: int = 50) -> List[str]:
+def _chunk_no_overlap(sentences: List[str], chunk_size: int) -> Iterator[str]:
+    """
+    Group sentences into chunks of approximately chunk_size characters with no overlap.
+    Equivalent to chunk_text with overlap=0, without its overlap bookkeeping.
+
+    Args:
+        sentences (List[str]): The sentences of the text, in order.
+        chunk_size (int): The target size for each chunk.
+
+    Yields:
+        str: Each text chunk, in order.
+    """
+    current_chunk = []
+    current_length = 0
+    for sentence in sentences:
+        if current_chunk and current_length + len(sentence) > chunk_size:
+            yield " ".join(current_chunk)
+            current_chunk = []
+            current_length = 0
+        current_chunk.append(sentence)
+        current_length += len(sentence)
+    yield " ".join(current_chunk)
+
+def chunk_text(text: str, chunk_size: int = 500, overlap: int = 50) -> Iterator[str]:
     """
     Split text into chunks of approximately chunk_size characters, respecting sentence boundaries.
-    Maintains an overlap between chunks.
+    Maintains an overlap between chunks. Chunks are produced lazily, one at a time.
 
     Args:
         text (str): The text to chunk.
         chunk_size (int): The target size for each chunk.
         overlap (int): The number of characters to overlap between chunks.
 
-    Returns:
-        List[str]: A list of text chunks.
+    Yields:
+        str: Each text chunk, in order.
     """
     if not text:
-        return []
+        return
 
     # Simple sentence splitting based on punctuation
     # This splits on . ! ? followed by a space or end of string
-    sentences = re.split(r'(?<=[.!?])\s+', text)
+    sentences = _SENTENCE_BOUNDARY.split(text)
+    if overlap <= 0:
+        yield from _chunk_no_overlap(sentences, chunk_size)
+        return
+
+    # prefix[i] is the total length of sentences[:i], so any run's length is one subtraction
+    prefix = list(accumulate((len(sentence) for sentence in sentences), initial=0))
     
-    chunks = []
-    current_chunk = []
-    current_length = 0
+    # The current chunk is sentences[start:i]
+    start = 0
     
-    for sentence in sentences:
-        sentence_len = len(sentence)
-        
+    for i in range(len(sentences)):
         # If adding this sentence exceeds chunk_size and we have content, save the chunk
-        if current_length + sentence_len > chunk_size and current_chunk:
-            # Join current sentences to form the chunk
-            chunk_str = " ".join(current_chunk)
-            chunks.append(chunk_str)
+        if prefix[i + 1] - prefix[start] > chunk_size and start < i:
+            yield " ".join(sentences[start:i])
             
             # Handle overlap
-            # We want to keep the last few sentences that fit within the overlap size
-            overlap_buffer = []
-            overlap_len = 0
-            for s in reversed(current_chunk):
-                if overlap_len + len(s) < overlap:
-                    overlap_buffer.insert(0, s)
-                    overlap_len += len(s)
-                else:
-                    break
-            
-            current_chunk = overlap_buffer
-            current_length = overlap_len
-        
-        current_chunk.append(sentence)
-        current_length += sentence_len
+            # Keep the last few sentences that fit within the overlap size by sliding start forward
+            while start < i and prefix[i] - prefix[start] >= overlap:
+                start += 1
     
-    # Add the last chunk if it exists
-    if current_chunk:
-        chunks.append(" ".join(current_chunk))
-        
-    return chunks
+    # Add the last chunk
+    yield " ".join(sentences[start:])
 
 def extract_metadata(doc: Dict[str, Any]) -> Dict[str, Any]:
     """
@@ -107,6 +188,30 @@ def extract_metadata(doc: Dict[str, Any]) -> Dict[str, Any]:
         'word_count': len(content.split()) if content else 0
     }
 
+def iter_document_chunks(doc: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    """
+    Process a document lazily: clean text, extract metadata, and yield chunks one at a time.
+    Feeding this to RAGPipeline.add_documents keeps only one shard of chunks in memory.
+
+    Args:
+        doc (Dict[str, Any]): The raw document dictionary.
+
+    Yields:
+        Dict[str, Any]: A dictionary containing a text chunk and its metadata.
+    """
+    raw_content = doc.get('content', '')
+    if not raw_content:
+        logger.warning(f"Document {doc.get('filename')} has no content.")
+        return
+
+    cleaned_content = clean_text(raw_content)
+    metadata = extract_metadata(doc)
+
+    # Build each chunk's metadata in one dict construction instead of copy-then-set
+    base_items = tuple(metadata.items())
+    for i, chunk in enumerate(chunk_text(cleaned_content)):
+        yield {'text': chunk, 'metadata': dict(base_items, chunk_index=i)}
+
 def create_document_chunks(doc: Dict[str, Any]) -> List[Dict[str, Any]]:
     """
     Process a document: clean text, extract metadata, and create chunks.
@@ -117,23 +222,31 @@ def create_document_chunks(doc: Dict[str, Any]) -> List[Dict[str, Any]]:
     Returns:
         List[Dict[str, Any]]: A list of dictionaries, each containing a text chunk and its metadata.
     """
-    raw_content = doc.get('content', '')
-    if not raw_content:
+    if not doc.get('content', ''):
         logger.warning(f"Document {doc.get('filename')} has no content.")
         return []
 
-    cleaned_content = clean_text(raw_content)
-    metadata = extract_metadata(doc)
-    text_chunks = chunk_text(cleaned_content)
-    
-    doc_chunks = []
-    for i, chunk in enumerate(text_chunks):
-        chunk_metadata = metadata.copy()
-        chunk_metadata['chunk_index'] = i
-        doc_chunks.append({
-            'text': chunk,
-            'metadata': chunk_metadata
-        })
-        
+    doc_chunks = list(iter_document_chunks(doc))
     logger.info(f"Created {len(doc_chunks)} chunks for {doc.get('filename')}")
     return doc_chunks
+
+def create_document_chunks_batch(docs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Process many documents at once, cleaning and chunking them in a process pool.
+
+    Args:
+        docs (List[Dict[str, Any]]): The raw document dictionaries.
+
+    Returns:
+        List[Dict[str, Any]]: Chunks of all documents, in document order.
+    """
+    if len(docs) < PARALLEL_CHUNKING_MIN_DOCS:
+        return [chunk for doc in docs for chunk in create_document_chunks(doc)]
+
+    try:
+        with ProcessPoolExecutor(max_workers=min(os.cpu_count() or 1, len(docs)), mp_context=_POOL_CONTEXT) as executor:
+            # Small batches of documents per task amortize the inter-process transfer
+            return list(chain.from_iterable(executor.map(create_document_chunks, docs, chunksize=4)))
+    except Exception as e:
+        logger.warning(f"Parallel chunking failed ({e}), chunking sequentially.")
+        return [chunk for doc in docs for chunk in create_document_chunks(doc)]